@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv, find_dotenv
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from github_api import GitHubAPI
+from http_cache import DiskResponseCache, cache_dir, token_fingerprint
+
+# Environment variable prefix for stored tokens
+TOKEN_PREFIX = "GITHUB_TOKEN_"
+# Seconds a cached identity is trusted before it is revalidated
+IDENTITY_TTL = 6 * 3600
+# Size cap of the on-disk identity cache
+IDENTITY_DISK_BYTES = 1024 * 1024
+# Tokens validated at the same time
+VALIDATION_WORKERS = 8
+
+
+def env_tokens():
+    """Load the .env file and return {name: token} for every stored token."""
+    load_dotenv(find_dotenv(usecwd=True))
+    return {k[len(TOKEN_PREFIX):]: v for k, v in os.environ.items() if k.startswith(TOKEN_PREFIX)}
+
+
+def is_rejection(error):
+    """Return True if a failed validation means GitHub refused the token.
+
+    Only a 401 does; other failures, such as being offline, rate limited
+    or a server error, say nothing about the token.
+    """
+    return isinstance(error, dict) and error.get("status") == 401
+
+
+class IdentityCache:
+    """On-disk cache of validated token identities.
+
+    Entries are keyed by token fingerprint and hold the /user profile,
+    the token's OAuth scopes and the time they were validated. The token
+    itself is never written to disk.
+    """
+    def __init__(self, store=None, ttl=IDENTITY_TTL):
+        self.store = store
+        self.ttl = ttl
+        if self.store is None:
+            try:
+                self.store = DiskResponseCache(os.path.join(cache_dir(), "identities.sqlite3"),
+                                               IDENTITY_DISK_BYTES)
+            except (OSError, sqlite3.Error):
+                self.store = None
+
+    def get(self, token):
+        """Return the cached identity for token, or None."""
+        if self.store is None:
+            return None
+        entry = self.store.get(f"identity {token_fingerprint(token)}")
+        if entry is None:
+            return None
+        try:
+            identity = json.loads(entry["content"])
+        except ValueError:
+            return None
+        identity["stored_at"] = entry["stored_at"]
+        return identity
+
+    def set(self, token, user, scopes):
+        """Store a freshly validated identity and return it."""
+        identity = {
+            "fingerprint": token_fingerprint(token),
+            "login": user.get("login"),
+            "id": user.get("id"),
+            "avatar_url": user.get("avatar_url"),
+            "scopes": scopes,
+            "user": user,
+        }
+        if self.store is not None:
+            self.store.set(f"identity {identity['fingerprint']}",
+                           {"content": json.dumps(identity).encode(), "stored_at": time.time()})
+        identity["stored_at"] = time.time()
+        return identity
+
+    def delete(self, token):
+        """Forget the identity of a token."""
+        if self.store is not None:
+            self.store.delete_prefix(f"identity {token_fingerprint(token)}")
+
+    def is_fresh(self, identity):
+        """Return True if identity is recent enough to skip revalidation."""
+        return time.time() - identity.get("stored_at", 0) < self.ttl
+
+
+_identity_cache = None
+
+
+def identity_cache():
+    """Return the application-wide IdentityCache, creating it on first use."""
+    global _identity_cache
+    if _identity_cache is None:
+        _identity_cache = IdentityCache()
+    return _identity_cache
+
+
+def validate_identity(token, cache=None):
+    """Validate a token and update the identity cache.
+
+    Returns (True, identity) or (False, {"status", "message"}). A token
+    GitHub rejects is dropped from the cache; other errors leave it untouched.
+    """
+    cache = cache or identity_cache()
+    ok, res = GitHubAPI(token).get_identity()
+    if ok:
+        return True, cache.set(token, res["user"], res["scopes"])
+    if is_rejection(res):
+        cache.delete(token)
+    return False, res
+
+
+class AccountRegistry(QObject):
+    """Application-wide list of stored accounts and their validation state.
+
+    Every window showing accounts reads from here, so each token is
+    validated at most once per session (unless a refresh is requested).
+    Entries are dicts with 'token', 'status' ('pending', 'valid' or
+    'invalid'), 'user' and 'error'. Validation runs on a thread pool and
+    account_changed is emitted on the GUI thread as each result arrives.
+    """
+    account_changed = pyqtSignal(str)
+    accounts_reloaded = pyqtSignal()
+    validated = pyqtSignal(str, str, bool, object)
+
+    def __init__(self, parent=None, cache=None):
+        super().__init__(parent)
+        self.cache = cache or identity_cache()
+        self.accounts = OrderedDict()
+        self.checked = set()
+        self.in_flight = set()
+        self.executor = ThreadPoolExecutor(max_workers=VALIDATION_WORKERS)
+        self.validated.connect(self.on_validated)
+        self.loaded = False
+
+    def load(self, revalidate=False):
+        """Re-read the stored tokens and validate the ones not checked yet.
+
+        Cached identities are used straight away; with revalidate every
+        token is checked against GitHub again.
+        """
+        previous = self.accounts
+        self.accounts = OrderedDict()
+        for name, token in env_tokens().items():
+            entry = previous.get(name)
+            if entry is None or entry["token"] != token:
+                entry = {"token": token, "status": "pending", "user": None, "error": None}
+                identity = self.cache.get(token)
+                if identity is not None:
+                    entry["status"] = "valid"
+                    entry["user"] = identity["user"]
+                    if self.cache.is_fresh(identity):
+                        self.checked.add(token)
+            self.accounts[name] = entry
+        self.loaded = True
+        self.accounts_reloaded.emit()
+
+        for name, entry in self.accounts.items():
+            token = entry["token"]
+            if (revalidate or token not in self.checked) and token not in self.in_flight:
+                self.in_flight.add(token)
+                self.executor.submit(self.validate, name, token)
+
+    def ensure_loaded(self):
+        """Load the accounts unless that already happened this session."""
+        if not self.loaded:
+            self.load()
+
+    def validate(self, name, token):
+        """Validate one token on a worker thread."""
+        try:
+            ok, res = validate_identity(token, self.cache)
+        except Exception as e:
+            ok, res = False, {"status": None, "message": str(e)}
+        self.validated.emit(name, token, ok, res)
+
+    def on_validated(self, name, token, ok, result):
+        """Record a validation result and notify listeners."""
+        self.in_flight.discard(token)
+        self.checked.add(token)
+        entry = self.accounts.get(name)
+        if entry is None or entry["token"] != token:
+            # The token was edited or removed while it was being checked
+            return
+        if ok:
+            entry.update(status="valid", user=result["user"], error=None)
+        elif is_rejection(result) or entry["status"] != "valid":
+            entry.update(status="invalid", user=None, error=result["message"])
+        else:
+            # Keep the cached identity when we are merely offline or rate limited
+            entry["error"] = result["message"]
+        self.account_changed.emit(name)
+
+    def get(self, name):
+        """Return the entry for an account name, or None."""
+        return self.accounts.get(name)
+
+    def items(self):
+        """Return (name, entry) pairs in the order the tokens are stored."""
+        return list(self.accounts.items())
+
+    def tokens(self):
+        """Return {name: token} for every stored account."""
+        return {name: entry["token"] for name, entry in self.accounts.items()}
+
+
+_registry = None
+
+
+def account_registry():
+    """Return the application-wide AccountRegistry, creating it on first use."""
+    global _registry
+    if _registry is None:
+        _registry = AccountRegistry()
+    return _registry
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice, QObject, QRunnable, QThreadPool, Qt, pyqtSignal
+from PyQt5.QtGui import QBrush, QImage, QPainter, QPixmap
+
+from github_api import DEFAULT_TIMEOUT, shared_session
+from http_cache import DiskResponseCache, cache_dir
+
+# Number of rounded pixmaps kept in memory
+MAX_CACHED_AVATARS = 512
+# Concurrent avatar downloads
+AVATAR_THREADS = 6
+# Size cap of the on-disk avatar cache
+AVATAR_DISK_BYTES = 20 * 1024 * 1024
+# Avatars on disk older than this are refreshed when the network is available
+AVATAR_MAX_AGE = 7 * 24 * 3600
+# Thread pool priorities: on-screen avatars are fetched before prefetched ones
+VISIBLE_PRIORITY = 1
+PREFETCH_PRIORITY = 0
+
+
+# Hosts whose avatar URLs accept an `s=` size parameter
+SIZED_AVATAR_HOSTS = ("avatars.githubusercontent.com", "github.com")
+
+
+def sized_avatar_url(url, pixels):
+    """Ask GitHub to downscale an avatar server-side to the given pixel size."""
+    parts = urlsplit(url)
+    if parts.hostname not in SIZED_AVATAR_HOSTS:
+        return url
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k not in ("s", "size")]
+    query.append(("s", str(pixels)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def open_avatar_disk_cache():
+    """Open the on-disk avatar store, or return None if it is unavailable."""
+    try:
+        return DiskResponseCache(os.path.join(cache_dir(), "avatars.sqlite3"), AVATAR_DISK_BYTES)
+    except (OSError, sqlite3.Error):
+        return None
+
+
+def png_bytes(image):
+    """Encode a QImage as PNG bytes."""
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, "PNG")
+    buffer.close()
+    return bytes(data)
+
+
+def rounded_image(data, size):
+    """Decode image bytes, scale them to size x size and clip to a circle."""
+    image = QImage()
+    if not image.loadFromData(data):
+        return None
+    image = image.scaled(size, size, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+    rounded = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+    rounded.fill(Qt.transparent)
+    painter = QPainter(rounded)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setBrush(QBrush(image))
+    painter.setPen(Qt.NoPen)
+    painter.drawEllipse(0, 0, size, size)
+    painter.end()
+    return rounded
+
+
+class AvatarJob(QRunnable):
+    """Download and round a single avatar on a worker thread.
+
+    The size is in device pixels and is passed on to GitHub, so only an
+    image of the needed size is transferred and decoded.
+    """
+    def __init__(self, service, url, size):
+        super().__init__()
+        self.service = service
+        self.url = url
+        self.size = size
+        self.cancelled = False
+
+    def run(self):
+        if self.cancelled:
+            # Nobody wants this avatar any more, e.g. its row scrolled away
+            return
+        disk = self.service.disk
+        key = f"{self.size} {self.url}"
+        entry = disk.get(key) if disk else None
+        image = None
+        if entry is not None and time.time() - entry["stored_at"] < AVATAR_MAX_AGE:
+            image = self.decode(entry["content"])
+        if image is None and not self.cancelled:
+            try:
+                r = shared_session().get(sized_avatar_url(self.url, self.size), timeout=DEFAULT_TIMEOUT)
+                if r.status_code == 200:
+                    image = rounded_image(r.content, self.size)
+                    if image is not None and disk:
+                        disk.set(key, {"content": png_bytes(image), "stored_at": time.time()})
+            except Exception:
+                pass
+        if image is None and entry is not None:
+            # Offline or failed refresh: an old avatar beats the placeholder
+            image = self.decode(entry["content"])
+        # QImage is safe to hand across threads; the pixmap is made on the GUI thread
+        self.service.loaded.emit(self.url, self.size, image if image is not None else QImage())
+
+    @staticmethod
+    def decode(data):
+        """Decode stored PNG bytes, returning None if they are unreadable."""
+        image = QImage()
+        return image if image.loadFromData(data) else None
+
+
+class AvatarService(QObject):
+    """Shared avatar loader that fetches off the GUI thread.
+
+    Concurrent requests for the same (url, size) share one download, and
+    rounded pixmaps are kept in a bounded LRU so repeated avatars are free.
+    The downscaled images are also stored on disk so that a cold start can
+    render account lists without network traffic.
+    """
+    avatar_ready = pyqtSignal(str, int, QPixmap)
+    loaded = pyqtSignal(str, int, QImage)
+
+    def __init__(self, parent=None, max_entries=MAX_CACHED_AVATARS, disk=None):
+        super().__init__(parent)
+        self.max_entries = max_entries
+        self.disk = disk if disk is not None else open_avatar_disk_cache()
+        self.cache = OrderedDict()
+        self.pending = {}
+        self.jobs = {}
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(AVATAR_THREADS)
+        self.loaded.connect(self.on_loaded)
+
+    def cached(self, url, size):
+        """Return the cached pixmap for (url, size), or None."""
+        pixmap = self.cache.get((url, size))
+        if pixmap is not None:
+            self.cache.move_to_end((url, size))
+        return pixmap
+
+    def request(self, url, size, callback=None, priority=VISIBLE_PRIORITY):
+        """Load an avatar of size x size device pixels and call callback(pixmap).
+
+        The callback runs on the GUI thread, immediately when the avatar is
+        cached, and receives None if the avatar could not be loaded. Jobs
+        with a higher priority are started first.
+        """
+        pixmap = self.cached(url, size)
+        if pixmap is not None:
+            if callback:
+                callback(pixmap)
+            return
+        waiters = self.pending.get((url, size))
+        if waiters is not None:
+            if callback:
+                waiters.append(callback)
+            return
+        self.pending[(url, size)] = [callback] if callback else []
+        job = AvatarJob(self, url, size)
+        self.jobs[(url, size)] = job
+        self.pool.start(job, priority)
+
+    def cancel(self, url, size, callback=None):
+        """Withdraw a request made with the same callback.
+
+        Once nobody is waiting for the avatar any more, its job is skipped
+        if it has not reached the network yet.
+        """
+        waiters = self.pending.get((url, size))
+        if waiters is None:
+            return
+        if callback in waiters:
+            waiters.remove(callback)
+        if not waiters:
+            del self.pending[(url, size)]
+            job = self.jobs.pop((url, size), None)
+            if job is not None:
+                job.cancelled = True
+
+    def on_loaded(self, url, size, image):
+        """Cache a finished download and notify everyone waiting for it."""
+        waiters = self.pending.pop((url, size), [])
+        self.jobs.pop((url, size), None)
+        pixmap = None
+        if not image.isNull():
+            pixmap = QPixmap.fromImage(image)
+            self.cache[(url, size)] = pixmap
+            self.cache.move_to_end((url, size))
+            while len(self.cache) > self.max_entries:
+                self.cache.popitem(last=False)
+            self.avatar_ready.emit(url, size, pixmap)
+        for callback in waiters:
+            try:
+                callback(pixmap)
+            except RuntimeError:
+                # The label was deleted while its avatar was loading
+                pass
+
+
+_service = None
+
+
+def avatar_service():
+    """Return the application-wide AvatarService, creating it on first use."""
+    global _service
+    if _service is None:
+        _service = AvatarService()
+    return _service
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+import atexit
+import codecs
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from http_cache import DiskResponseCache, cache_dir
+
+# Size cap of the in-memory blob cache
+BLOB_MEMORY_BYTES = 32 * 1024 * 1024
+# Size cap of the on-disk blob cache
+BLOB_DISK_BYTES = 200 * 1024 * 1024
+# Files larger than this are not returned inline by the contents API
+INLINE_CONTENT_LIMIT = 1024 * 1024
+# Bytes decoded at a time when reading a downloaded blob
+DECODE_CHUNK_SIZE = 256 * 1024
+
+
+def git_blob_sha(data):
+    """Return the git object id of a blob with the given content."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def open_blob_disk_cache():
+    """Open the on-disk blob store, or return None if it is unavailable."""
+    try:
+        return DiskResponseCache(os.path.join(cache_dir(), "blobs.sqlite3"), BLOB_DISK_BYTES)
+    except (OSError, sqlite3.Error):
+        return None
+
+
+_blob_dir = None
+
+
+def blob_file_path(sha):
+    """Return where a large blob is downloaded to for this session.
+
+    Files are named by SHA, so a blob that was already downloaded is
+    reused; the directory is removed when the application exits.
+    """
+    global _blob_dir
+    if _blob_dir is None:
+        _blob_dir = tempfile.mkdtemp(prefix="github-app-blobs-")
+        atexit.register(shutil.rmtree, _blob_dir, True)
+    return os.path.join(_blob_dir, sha)
+
+
+def iter_text_chunks(path, encoding="utf-8", chunk_size=DECODE_CHUNK_SIZE):
+    """Decode a file a chunk at a time, replacing undecodable bytes."""
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    with open(path, "rb") as fp:
+        while True:
+            chunk = fp.read(chunk_size)
+            if not chunk:
+                break
+            yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+
+class BlobCache:
+    """Content-addressed cache of file contents keyed by git blob SHA.
+
+    A SHA always names the same bytes, so entries never go stale and files
+    that are identical across repositories or branches are stored once.
+    Recently used blobs are kept in memory up to max_bytes; an optional
+    disk tier keeps them across restarts.
+    """
+    def __init__(self, max_bytes=BLOB_MEMORY_BYTES, disk=None):
+        self.max_bytes = max_bytes
+        self.disk = disk
+        self.blobs = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def get(self, sha):
+        """Return the content of a blob, or None if it is not cached."""
+        with self.lock:
+            data = self.blobs.get(sha)
+            if data is not None:
+                self.blobs.move_to_end(sha)
+                return data
+        if self.disk is None:
+            return None
+        entry = self.disk.get(f"blob {sha}")
+        if entry is None:
+            return None
+        self._remember(sha, entry["content"])
+        return entry["content"]
+
+    def set(self, sha, data):
+        """Store a blob's content; content that does not match sha is ignored."""
+        if git_blob_sha(data) != sha:
+            return False
+        self._remember(sha, data)
+        if self.disk is not None:
+            self.disk.set(f"blob {sha}", {"content": data, "stored_at": time.time()})
+        return True
+
+    def _remember(self, sha, data):
+        if len(data) > self.max_bytes:
+            return
+        with self.lock:
+            old = self.blobs.pop(sha, None)
+            if old is not None:
+                self.size -= len(old)
+            self.blobs[sha] = data
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                _, evicted = self.blobs.popitem(last=False)
+                self.size -= len(evicted)
+
+
+_blob_cache = None
+
+
+def blob_cache():
+    """Return the application-wide BlobCache, creating it on first use."""
+    global _blob_cache
+    if _blob_cache is None:
+        _blob_cache = BlobCache(disk=open_blob_disk_cache())
+    return _blob_cache
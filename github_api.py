@@ -1,41 +1,532 @@
 #!/usr/bin/env python3
+import asyncio
 import base64
+import copy
+import functools
+import json
+import random
+import tempfile
+import threading
+import time
 import requests
 import os
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+
+from http_cache import (
+    CachedResponse, cache_key, conditional_headers, is_file_content, is_fresh, make_entry,
+    shared_response_cache
+)
+
+API_URL = "https://api.github.com"
+
+# Connection pool defaults shared by every GitHubAPI instance
+DEFAULT_POOL_SIZE = 20
+DEFAULT_TIMEOUT = (5, 30)  # (connect, read) seconds
+
+# Rate limit scheduling
+RATE_LIMIT_RESERVE = 0.1    # start pacing once less than 10% of a budget is left
+SECONDARY_LIMIT_WAIT = 60   # GitHub asks for at least a minute when no Retry-After is sent
+MAX_RATE_LIMIT_RETRIES = 3
+# Longest rate limit wait a client accepts before failing; bulk clients use None to wait it out
+INTERACTIVE_MAX_WAIT = 2
+
+# Maximum number of aliased lookups sent in one GraphQL query
+GRAPHQL_BATCH_SIZE = 100
+# Bytes read per chunk when streaming a blob to disk
+BLOB_CHUNK_SIZE = 64 * 1024
+
+# Transient failure retries
+DEFAULT_RETRIES = 3
+RETRY_STATUSES = (500, 502, 503, 504)
+
+_shared_session = None
+_shared_session_lock = threading.Lock()
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+# Background work: revalidating stale cache entries and prefetching pages
+_background_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="github-background")
+_revalidating = set()
+_revalidating_lock = threading.Lock()
+
+
+def create_session(pool_size=DEFAULT_POOL_SIZE):
+    """Create a requests session backed by a keep-alive connection pool."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    return session
+
+
+def shared_session():
+    """Return the process-wide session so all accounts reuse one pool."""
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            _shared_session = create_session()
+        return _shared_session
+
+
+def configure_shared_session(pool_size=DEFAULT_POOL_SIZE):
+    """Replace the process-wide session with one using a new pool size."""
+    global _shared_session
+    with _shared_session_lock:
+        old = _shared_session
+        _shared_session = create_session(pool_size)
+    if old is not None:
+        old.close()
+    return _shared_session
+
+
+class GitHubAPIError(Exception):
+    """Raised by the iterator methods when GitHub returns an error response."""
+    def __init__(self, status_code, message=""):
+        super().__init__(f"Error {status_code}: {message}" if message else f"Error {status_code}")
+        self.status_code = status_code
+
+
+class RateLimitedError(Exception):
+    """Raised when a request would have to wait longer than the client's max_wait."""
+    def __init__(self, retry_at):
+        super().__init__(f"Rate limited, retry at {time.strftime('%H:%M:%S', time.localtime(retry_at))}")
+        self.retry_at = retry_at
+
+
+def _next_link(response):
+    """Return the rel="next" URL from a response's Link header, if any."""
+    for part in response.headers.get("Link", "").split(","):
+        section = part.split(";")
+        if len(section) < 2:
+            continue
+        url = section[0].strip().strip("<>")
+        if any(p.strip() == 'rel="next"' for p in section[1:]):
+            return url
+    return None
+
+
+def _int_header(headers, name):
+    """Read an integer response header, returning None if absent or malformed."""
+    try:
+        return int(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Per-token scheduler that paces requests using GitHub's rate limit headers.
+
+    Budgets are tracked per rate limit resource (core, search, graphql). Once a
+    budget runs low the remaining requests are spread evenly until its reset;
+    an exhausted budget or a secondary rate limit blocks until it clears.
+    Callers that pass max_wait are not paced and fail instead of blocking
+    for longer than that.
+    """
+    def __init__(self, reserve=RATE_LIMIT_RESERVE):
+        self.reserve = reserve
+        self.buckets = {}
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def resource_for(url):
+        """Guess which rate limit resource a request URL is charged against."""
+        if "/search/" in url:
+            return "search"
+        if url.rstrip("/").endswith("/graphql"):
+            return "graphql"
+        return "core"
+
+    def delay(self, resource, max_wait=None):
+        """Reserve a request slot and return the seconds to wait before sending it.
+
+        Nothing is reserved if the wait would exceed max_wait.
+        """
+        with self.lock:
+            now = time.time()
+            wait = max(0.0, self.blocked_until - now)
+            bucket = self.buckets.get(resource)
+            active = bucket is not None and now < bucket["reset"]
+            if active and bucket["remaining"] <= 0:
+                wait = max(wait, bucket["reset"] - now)
+            if max_wait is not None and wait > max_wait:
+                return wait
+            if active and bucket["remaining"] > 0:
+                if max_wait is None and bucket["remaining"] < bucket["limit"] * self.reserve:
+                    start = max(now + wait, bucket["next"])
+                    interval = max(0.0, bucket["reset"] - start) / bucket["remaining"]
+                    bucket["next"] = start + interval
+                    wait = start - now
+                bucket["remaining"] -= 1
+            return wait
+
+    def wait(self, resource, max_wait=None):
+        """Block until a request against resource may be sent.
+
+        Raises RateLimitedError if that would take longer than max_wait.
+        """
+        delay = self.delay(resource, max_wait)
+        if max_wait is not None and delay > max_wait:
+            raise RateLimitedError(time.time() + delay)
+        if delay > 0:
+            time.sleep(delay)
+
+    def update(self, response, resource):
+        """Record the budget a response reports.
+
+        Returns the number of seconds to back off if the response was rate
+        limited, or None otherwise.
+        """
+        headers = response.headers
+        now = time.time()
+        remaining = _int_header(headers, "X-RateLimit-Remaining")
+        reset = _int_header(headers, "X-RateLimit-Reset")
+        limit = _int_header(headers, "X-RateLimit-Limit")
+        resource = headers.get("X-RateLimit-Resource", resource)
+
+        with self.lock:
+            if remaining is not None and reset is not None:
+                bucket = self.buckets.setdefault(resource, {"next": 0.0})
+                bucket.update(limit=limit or remaining, remaining=remaining, reset=reset)
+
+            if response.status_code not in (403, 429):
+                return None
+            retry_after = _int_header(headers, "Retry-After")
+            if retry_after is not None:
+                backoff = retry_after
+            elif remaining == 0 and reset is not None:
+                backoff = max(0, reset - now) + 1
+            elif response.status_code == 429 or "rate limit" in response.text.lower():
+                backoff = SECONDARY_LIMIT_WAIT
+            else:
+                # A plain permission error, not a rate limit
+                return None
+            self.blocked_until = max(self.blocked_until, now + backoff)
+            return backoff
+
+
+class RetryPolicy:
+    """Exponential backoff with jitter for transient failures.
+
+    Only requests that are safe to repeat are retried: reads, plus the
+    PUT/DELETE calls that star, unstar, follow and unfollow.
+    """
+    SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+    IDEMPOTENT_PATHS = ("/user/starred/", "/user/following/")
+
+    def __init__(self, retries=DEFAULT_RETRIES, backoff=0.5, max_backoff=30.0, jitter=0.5,
+                 statuses=RETRY_STATUSES):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = statuses
+
+    def is_retryable(self, method, url):
+        """Return True if repeating this request cannot cause a duplicate side effect."""
+        method = method.upper()
+        if method in self.SAFE_METHODS:
+            return True
+        if method == "POST" and url.rstrip("/").endswith("/graphql"):
+            # The app only sends read-only GraphQL queries
+            return True
+        return method in ("PUT", "DELETE") and any(p in url for p in self.IDEMPOTENT_PATHS)
+
+    def delay(self, attempt, retry_after=None):
+        """Seconds to sleep before the given retry attempt (1-based)."""
+        base = min(self.max_backoff, self.backoff * (2 ** (attempt - 1)))
+        delay = base * (1 - self.jitter * random.random())
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+
+class RetryStats:
+    """Thread-safe counters describing how requests fared under a RetryPolicy."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.retried = 0     # requests that needed at least one retry
+        self.recovered = 0   # retried requests that eventually succeeded
+        self.gave_up = 0     # retried requests that still failed
+        self.attempts = 0    # total retry attempts made
+
+    def record(self, retries, ok):
+        """Record the outcome of one request that was retried `retries` times."""
+        if not retries:
+            return
+        with self.lock:
+            self.retried += 1
+            self.attempts += retries
+            if ok:
+                self.recovered += 1
+            else:
+                self.gave_up += 1
+
+    def snapshot(self):
+        """Return the current counters as a dict."""
+        with self.lock:
+            return {
+                "retried": self.retried,
+                "recovered": self.recovered,
+                "gave_up": self.gave_up,
+                "attempts": self.attempts,
+            }
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+def rate_limiter_for(token):
+    """Return the shared RateLimiter for a token."""
+    with _rate_limiters_lock:
+        if token not in _rate_limiters:
+            _rate_limiters[token] = RateLimiter()
+        return _rate_limiters[token]
+
 
 class GitHubAPI:
     """GitHub API wrapper with comprehensive functionality."""
-    def __init__(self, token):
+    def __init__(self, token, session=None, timeout=DEFAULT_TIMEOUT, retry_policy=None, cache=None,
+                 max_wait=INTERACTIVE_MAX_WAIT):
         self.token = token
         self.headers = {
             "Authorization": f"token {token}",
             "Accept": "application/vnd.github+json",
         }
+        # Instances share the pooled session unless one is passed in
+        self.session = session or shared_session()
+        self.timeout = timeout
+        # Every client for the same token shares one rate limit budget
+        self.rate_limiter = rate_limiter_for(token)
+        # Interactive clients fail fast on rate limits; None waits until they clear
+        self.max_wait = max_wait
+        self.retry_policy = retry_policy or DEFAULT_RETRY_POLICY
+        self.retry_stats = RetryStats()
+        # Conditional GET cache; pass cache=False to disable it
+        self.cache = shared_response_cache() if cache is None else cache
+
+    def with_max_wait(self, max_wait):
+        """Return a client sharing this one's session, budget and counters but another max_wait."""
+        client = copy.copy(self)
+        client.max_wait = max_wait
+        return client
+
+    def _cached_get(self, url, stale_ok=False, **kwargs):
+        """GET a URL with If-None-Match/If-Modified-Since, serving 304s from the cache.
+
+        GitHub does not charge the rate limit for 304 responses, so repeated
+        reads of unchanged resources are nearly free. Entries younger than
+        their endpoint TTL are served without a request; with stale_ok an
+        older entry is served at once and revalidated in the background.
+        """
+        if not self.cache:
+            return self._request("GET", url, **kwargs)
+        key = cache_key(self.token, url)
+        entry = self.cache.get(key)
+        if entry is not None:
+            if is_fresh(entry, url):
+                return CachedResponse(entry)
+            if stale_ok:
+                self._revalidate_later(key, url)
+                return CachedResponse(entry)
+        return self._revalidate(key, url, entry, **kwargs)
+
+    def _revalidate(self, key, url, entry, **kwargs):
+        """Send a conditional GET for url and refresh the cache entry."""
+        if entry is not None:
+            kwargs["headers"] = conditional_headers(kwargs.get("headers", self.headers), entry)
+        r = self._request("GET", url, **kwargs)
+        if r.status_code == 304 and entry is not None:
+            entry["stored_at"] = time.time()
+            self.cache.set(key, entry)
+            return CachedResponse(entry, r.headers)
+        if r.status_code == 200 and not is_file_content(url, r):
+            new_entry = make_entry(r)
+            if new_entry is not None:
+                self.cache.set(key, new_entry)
+        return r
+
+    def _revalidate_later(self, key, url):
+        """Revalidate a stale entry on a background thread, once per key."""
+        with _revalidating_lock:
+            if key in _revalidating:
+                return
+            _revalidating.add(key)
+
+        def run():
+            try:
+                self._revalidate(key, url, self.cache.get(key))
+            except Exception:
+                pass
+            finally:
+                with _revalidating_lock:
+                    _revalidating.discard(key)
+
+        _background_executor.submit(run)
+
+    def _iter_pages(self, url, items_key=None, prefetch=False, stale_ok=False, pages=False):
+        """Yield items from every page of a paginated endpoint.
+
+        Pages are followed through Link: rel="next" and fetched lazily; with
+        prefetch the next page is requested while the current one is consumed.
+        With pages each page is yielded as one list of items.
+        """
+        pending = None
+        while url:
+            r = pending.result() if pending is not None else self._cached_get(url, stale_ok=stale_ok)
+            pending = None
+            if r.status_code != 200:
+                try:
+                    message = r.json().get("message", "")
+                except Exception:
+                    message = ""
+                raise GitHubAPIError(r.status_code, message)
+            url = _next_link(r)
+            if url and prefetch:
+                pending = _background_executor.submit(self._cached_get, url, stale_ok=stale_ok)
+            data = r.json()
+            items = data.get(items_key, []) if items_key else data
+            if pages:
+                yield items
+                continue
+            for item in items:
+                yield item
+
+    def _invalidate_after_write(self, url):
+        """Drop cached reads that a successful write to url may have changed."""
+        if not self.cache or not url.startswith(API_URL):
+            return
+        parts = url[len(API_URL):].split("?")[0].strip("/").split("/")
+        if parts[:2] in (["user", "following"], ["user", "repos"]):
+            prefix = "/".join(parts[:2])
+        elif parts[0] == "repos" and len(parts) >= 3:
+            prefix = "/".join(parts[:3])
+        elif parts == ["user"]:
+            prefix = "user"
+        else:
+            return
+        self.cache.delete_prefix(cache_key(self.token, f"{API_URL}/{prefix}"))
+
+    def _request(self, method, url, **kwargs):
+        """Send a request through the pooled session with default headers and timeout.
+
+        Requests are paced by the token's RateLimiter, rate limited responses
+        are retried once the limit has cleared, and transient failures of
+        idempotent requests are retried according to the RetryPolicy. A rate
+        limit that would take longer than max_wait to clear raises
+        RateLimitedError instead.
+        """
+        kwargs.setdefault("headers", self.headers)
+        kwargs.setdefault("timeout", self.timeout)
+        resource = RateLimiter.resource_for(url)
+        policy = self.retry_policy
+        retryable = policy.is_retryable(method, url)
+        retries = 0
+        rate_limit_waits = 0
+        while True:
+            self.rate_limiter.wait(resource, self.max_wait)
+            try:
+                r = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if not retryable or retries >= policy.retries:
+                    self.retry_stats.record(retries, ok=False)
+                    raise
+                retries += 1
+                time.sleep(policy.delay(retries))
+                continue
+
+            backoff = self.rate_limiter.update(r, resource)
+            if backoff is not None and self.max_wait is not None and backoff > self.max_wait:
+                r.close()
+                raise RateLimitedError(time.time() + backoff)
+            if backoff is not None and rate_limit_waits < MAX_RATE_LIMIT_RETRIES:
+                rate_limit_waits += 1
+                continue
+            if r.status_code in policy.statuses and retryable and retries < policy.retries:
+                retries += 1
+                time.sleep(policy.delay(retries, _int_header(r.headers, "Retry-After")))
+                continue
+            break
+        self.retry_stats.record(retries, ok=r.status_code not in policy.statuses)
+        if method.upper() != "GET" and r.status_code < 400:
+            self._invalidate_after_write(url)
+        return r
 
     def validate_token(self):
         """Validate the token by fetching the user profile."""
+        ok, res = self.get_identity()
+        return (True, res["user"]) if ok else (False, res["message"])
+
+    def get_identity(self):
+        """Fetch the user profile together with the token's OAuth scopes.
+
+        On failure the result is {"status", "message"}; status is the HTTP
+        status code, or None if no response was received.
+        """
         try:
-            r = requests.get("https://api.github.com/user", headers=self.headers)
+            r = self._request("GET", "https://api.github.com/user")
             if r.status_code == 200:
-                return True, r.json()
-            return False, f"Error {r.status_code}: Token invalid"
+                scopes = [s.strip() for s in r.headers.get("X-OAuth-Scopes", "").split(",") if s.strip()]
+                return True, {"user": r.json(), "scopes": scopes}
+            message = f"Error {r.status_code}: Token invalid" if r.status_code == 401 else f"Error {r.status_code}"
+            return False, {"status": r.status_code, "message": message}
         except Exception as e:
-            return False, str(e)
+            return False, {"status": None, "message": str(e)}
 
     def get_user_info(self, username):
         """Get information about a GitHub user."""
         try:
-            r = requests.get(f"https://api.github.com/users/{username}", headers=self.headers)
+            r = self._cached_get(f"https://api.github.com/users/{username}")
             if r.status_code == 200:
                 return True, r.json()
             return False, f"Error {r.status_code}"
         except Exception as e:
             return False, str(e)
 
+    def get_users_info(self, logins):
+        """Get profile fields for many users with batched GraphQL queries.
+
+        Up to GRAPHQL_BATCH_SIZE logins are looked up per request using
+        aliased fields. Returns a dict keyed by login with REST-style keys
+        (login, type, avatar_url, location, company); logins that do not
+        exist are omitted.
+        """
+        users = {}
+        logins = list(dict.fromkeys(logins))
+        try:
+            for start in range(0, len(logins), GRAPHQL_BATCH_SIZE):
+                batch = logins[start:start + GRAPHQL_BATCH_SIZE]
+                fields = "\n".join(
+                    f"u{i}: repositoryOwner(login: {json.dumps(login)}) {{"
+                    " login avatarUrl __typename"
+                    " ... on User { location company }"
+                    " ... on Organization { location } }"
+                    for i, login in enumerate(batch)
+                )
+                r = self._request("POST", "https://api.github.com/graphql",
+                                  json={"query": f"query {{\n{fields}\n}}"})
+                if r.status_code != 200:
+                    return False, f"Error {r.status_code}: {r.json().get('message', '')}"
+                for node in (r.json().get("data") or {}).values():
+                    if not node:
+                        continue
+                    users[node["login"]] = {
+                        "login": node["login"],
+                        "type": node["__typename"],
+                        "avatar_url": node.get("avatarUrl", ""),
+                        "location": node.get("location") or "",
+                        "company": node.get("company") or "",
+                    }
+            return True, users
+        except Exception as e:
+            return False, str(e)
+
     def search_users(self, query):
         """Search for GitHub users by username."""
         try:
-            r = requests.get(f"https://api.github.com/search/users?q={query}", headers=self.headers)
+            r = self._request("GET", f"https://api.github.com/search/users?q={query}")
             if r.status_code == 200:
                 return True, r.json().get('items', [])
             return False, f"Error {r.status_code}"
@@ -45,7 +536,7 @@ class GitHubAPI:
     def follow_user(self, user):
         """Follow a GitHub user."""
         try:
-            r = requests.put(f"https://api.github.com/user/following/{user}", headers=self.headers)
+            r = self._request("PUT", f"https://api.github.com/user/following/{user}")
             return (r.status_code == 204), (f"Followed {user}" if r.status_code == 204 else f"Error {r.status_code}")
         except Exception as e:
             return False, str(e)
@@ -53,7 +544,7 @@ class GitHubAPI:
     def unfollow_user(self, user):
         """Unfollow a GitHub user."""
         try:
-            r = requests.delete(f"https://api.github.com/user/following/{user}", headers=self.headers)
+            r = self._request("DELETE", f"https://api.github.com/user/following/{user}")
             return (r.status_code == 204), (f"Unfollowed {user}" if r.status_code == 204 else f"Error {r.status_code}")
         except Exception as e:
             return False, str(e)
@@ -61,7 +552,7 @@ class GitHubAPI:
     def star_repo(self, owner, repo):
         """Star a GitHub repository."""
         try:
-            r = requests.put(f"https://api.github.com/user/starred/{owner}/{repo}", headers=self.headers)
+            r = self._request("PUT", f"https://api.github.com/user/starred/{owner}/{repo}")
             return (r.status_code == 204), (f"Starred {owner}/{repo}" if r.status_code == 204 else f"Error {r.status_code}")
         except Exception as e:
             return False, str(e)
@@ -69,36 +560,49 @@ class GitHubAPI:
     def unstar_repo(self, owner, repo):
         """Unstar a GitHub repository."""
         try:
-            r = requests.delete(f"https://api.github.com/user/starred/{owner}/{repo}", headers=self.headers)
+            r = self._request("DELETE", f"https://api.github.com/user/starred/{owner}/{repo}")
             return (r.status_code == 204), (f"Unstarred {owner}/{repo}" if r.status_code == 204 else f"Error {r.status_code}")
         except Exception as e:
             return False, str(e)
 
+    def iter_search_users(self, query, prefetch=False, pages=False):
+        """Lazily yield every user matching a search query (or, with pages, each page of them)."""
+        return self._iter_pages(f"https://api.github.com/search/users?q={query}&per_page=100",
+                                items_key="items", prefetch=prefetch, pages=pages)
+
     def get_following(self):
         """Get list of users being followed."""
         try:
-            r = requests.get("https://api.github.com/user/following", headers=self.headers)
-            if r.status_code == 200:
-                return True, r.json()
-            return False, f"Error {r.status_code}"
+            return True, list(self.iter_following())
+        except GitHubAPIError as e:
+            return False, f"Error {e.status_code}"
         except Exception as e:
             return False, str(e)
 
-    def get_repos(self):
+    def iter_following(self, prefetch=False, pages=False):
+        """Lazily yield every user being followed (or, with pages, each page of them)."""
+        return self._iter_pages("https://api.github.com/user/following?per_page=100",
+                                prefetch=prefetch, pages=pages)
+
+    def get_repos(self, stale_ok=False):
         """Get list of user repositories."""
         try:
-            r = requests.get("https://api.github.com/user/repos?per_page=100", headers=self.headers)
-            if r.status_code == 200:
-                return True, r.json()
-            return False, f"Error {r.status_code}"
+            return True, list(self.iter_repos(stale_ok=stale_ok))
+        except GitHubAPIError as e:
+            return False, f"Error {e.status_code}"
         except Exception as e:
             return False, str(e)
 
+    def iter_repos(self, prefetch=False, stale_ok=False):
+        """Lazily yield every repository of the user, page by page."""
+        return self._iter_pages("https://api.github.com/user/repos?per_page=100",
+                                prefetch=prefetch, stale_ok=stale_ok)
+
     def create_repo(self, name, desc, private):
         """Create a new repository."""
         data = {"name": name, "description": desc, "private": private}
         try:
-            r = requests.post("https://api.github.com/user/repos", headers=self.headers, json=data)
+            r = self._request("POST", "https://api.github.com/user/repos", json=data)
             if r.status_code == 201:
                 return True, r.json()
             return False, f"Error {r.status_code}: {r.json().get('message', '')}"
@@ -112,24 +616,87 @@ class GitHubAPI:
             fn = os.path.basename(path)
             up_url = f"https://api.github.com/repos/{owner}/{repo}/contents/{fn}"
             data = {"message": f"Add {fn}", "content": enc}
-            r = requests.put(up_url, headers=self.headers, json=data)
+            r = self._request("PUT", up_url, json=data)
             if r.status_code in [200, 201]:
                 return True, f"Uploaded {fn}"
             return False, f"Error {r.status_code}: {r.json().get('message', '')}"
         except Exception as e:
             return False, str(e)
 
-    def get_contents(self, owner, repo, path=""):
+    def get_contents(self, owner, repo, path="", stale_ok=False):
         """Get contents of path within the repository."""
         url = f"https://api.github.com/repos/{owner}/{repo}/contents/{path}"
         try:
-            r = requests.get(url, headers=self.headers)
+            r = self._cached_get(url, stale_ok=stale_ok)
             if r.status_code == 200:
                 return True, r.json()
             return False, f"Error {r.status_code}: {r.json().get('message', '')}"
         except Exception as e:
             return False, str(e)
 
+    def get_head_sha(self, owner, repo, ref="HEAD"):
+        """Get the commit SHA a branch (by default the default branch) points at."""
+        url = f"https://api.github.com/repos/{owner}/{repo}/commits/{ref}"
+        # The sha media type returns just the SHA; unchanged heads come back as free 304s
+        headers = dict(self.headers, Accept="application/vnd.github.sha")
+        try:
+            r = self._cached_get(url, headers=headers)
+            if r.status_code == 200:
+                return True, r.text.strip()
+            return False, f"Error {r.status_code}"
+        except Exception as e:
+            return False, str(e)
+
+    def get_tree(self, owner, repo, sha, recursive=True):
+        """Get the git tree of a commit or tree SHA, including subtrees if recursive."""
+        url = f"https://api.github.com/repos/{owner}/{repo}/git/trees/{sha}"
+        if recursive:
+            url += "?recursive=1"
+        try:
+            r = self._cached_get(url)
+            if r.status_code == 200:
+                return True, r.json()
+            return False, f"Error {r.status_code}: {r.json().get('message', '')}"
+        except Exception as e:
+            return False, str(e)
+
+    def download_blob(self, owner, repo, sha, dest, progress=None):
+        """Stream a blob's raw content into the file dest.
+
+        Works for files too large for inline contents (up to 100 MB). The
+        body is written in chunks as it arrives, and progress(done, total)
+        is called after each one; total is 0 if the size is unknown. Each
+        download writes its own temporary file, so concurrent downloads of
+        the same blob cannot interleave.
+        """
+        url = f"https://api.github.com/repos/{owner}/{repo}/git/blobs/{sha}"
+        headers = dict(self.headers, Accept="application/vnd.github.raw+json")
+        try:
+            r = self._request("GET", url, headers=headers, stream=True)
+            try:
+                if r.status_code != 200:
+                    return False, f"Error {r.status_code}"
+                total = _int_header(r.headers, "Content-Length") or 0
+                done = 0
+                fd, part = tempfile.mkstemp(suffix=".part", dir=os.path.dirname(dest) or None)
+                try:
+                    with os.fdopen(fd, "wb") as fp:
+                        for chunk in r.iter_content(BLOB_CHUNK_SIZE):
+                            fp.write(chunk)
+                            done += len(chunk)
+                            if progress:
+                                progress(done, total)
+                    # Only complete downloads ever appear under dest
+                    os.replace(part, dest)
+                except Exception:
+                    os.remove(part)
+                    raise
+                return True, dest
+            finally:
+                r.close()
+        except Exception as e:
+            return False, str(e)
+
     def update_file(self, owner, repo, path, message, new_content, sha):
         """Update an existing file in a repository."""
         url = f"https://api.github.com/repos/{owner}/{repo}/contents/{path}"
@@ -139,7 +706,7 @@ class GitHubAPI:
             "sha": sha
         }
         try:
-            r = requests.put(url, headers=self.headers, json=data)
+            r = self._request("PUT", url, json=data)
             if r.status_code in [200, 201]:
                 return True, r.json()
             return False, f"Error {r.status_code}: {r.json().get('message', '')}"
@@ -151,7 +718,7 @@ class GitHubAPI:
         url = f"https://api.github.com/repos/{owner}/{repo}/contents/{path}"
         data = {"message": message, "sha": sha}
         try:
-            r = requests.delete(url, headers=self.headers, json=data)
+            r = self._request("DELETE", url, json=data)
             if r.status_code == 200:
                 return True, f"File '{path}' deleted"
             return False, f"Error {r.status_code}: {r.json().get('message', '')}"
@@ -162,7 +729,7 @@ class GitHubAPI:
         """Enable wiki for a repository."""
         url = f"https://api.github.com/repos/{owner}/{repo}"
         data = {"has_wiki": True}
-        r = requests.patch(url, headers=self.headers, json=data)
+        r = self._request("PATCH", url, json=data)
         if r.status_code == 200:
             return True, "Wiki enabled."
         return False, f"Error {r.status_code}: {r.json().get('message', '')}"
@@ -171,7 +738,7 @@ class GitHubAPI:
         """Disable wiki for a repository."""
         url = f"https://api.github.com/repos/{owner}/{repo}"
         data = {"has_wiki": False}
-        r = requests.patch(url, headers=self.headers, json=data)
+        r = self._request("PATCH", url, json=data)
         if r.status_code == 200:
             return True, "Wiki disabled."
         return False, f"Error {r.status_code}: {r.json().get('message', '')}"
@@ -183,7 +750,7 @@ class GitHubAPI:
             "ref": f"refs/heads/{branch_name}",
             "sha": base_sha
         }
-        r = requests.post(url, headers=self.headers, json=data)
+        r = self._request("POST", url, json=data)
         if r.status_code == 201:
             return True, f"Branch '{branch_name}' created."
         return False, f"Error {r.status_code}: {r.json().get('message', '')}"
@@ -191,7 +758,7 @@ class GitHubAPI:
     def delete_branch(self, owner, repo, branch_name):
         """Delete a branch in a repository."""
         url = f"https://api.github.com/repos/{owner}/{repo}/git/refs/heads/{branch_name}"
-        r = requests.delete(url, headers=self.headers)
+        r = self._request("DELETE", url)
         if r.status_code == 204:
             return True, f"Branch '{branch_name}' deleted."
         return False, f"Error {r.status_code}: {r.json().get('message', '')}"
@@ -207,9 +774,138 @@ class GitHubAPI:
             "blog": blog
         }
         try:
-            r = requests.patch(url, headers=self.headers, json=data)
+            r = self._request("PATCH", url, json=data)
             if r.status_code == 200:
                 return True, r.json()
             return False, f"Error {r.status_code}: {r.json().get('message', '')}"
         except Exception as e:
-            return False, str(e)
\ No newline at end of file
+            return False, str(e)
+
+
+class ThreadedGitHubAPI:
+    """Awaitable wrapper that runs blocking GitHubAPI calls on a thread pool.
+
+    This is not an async HTTP client: every call occupies one worker
+    thread for its whole duration, so at most max_workers requests are in
+    flight per instance, all sharing the pooled session (DEFAULT_POOL_SIZE
+    connections). It lets coroutine code such as the bulk operation lanes
+    drive the blocking client without stalling the event loop.
+    """
+    def __init__(self, token, session=None, timeout=DEFAULT_TIMEOUT, max_workers=DEFAULT_POOL_SIZE,
+                 retry_policy=None, api=None):
+        self.api = api or GitHubAPI(token, session, timeout, retry_policy)
+        self.token = token
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="github-api")
+
+    @classmethod
+    def from_api(cls, api, max_workers=DEFAULT_POOL_SIZE):
+        """Wrap an existing GitHubAPI, sharing its session, policies and counters."""
+        return cls(api.token, max_workers=max_workers, api=api)
+
+    @property
+    def retry_stats(self):
+        return self.api.retry_stats
+
+    async def _call(self, func, *args, **kwargs):
+        """Run a blocking GitHubAPI method on the worker pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    def close(self):
+        """Shut down the worker pool."""
+        self._executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+    async def validate_token(self):
+        """Validate the token by fetching the user profile."""
+        return await self._call(self.api.validate_token)
+
+    async def get_user_info(self, username):
+        """Get information about a GitHub user."""
+        return await self._call(self.api.get_user_info, username)
+
+    async def get_users_info(self, logins):
+        """Get profile fields for many users with batched GraphQL queries."""
+        return await self._call(self.api.get_users_info, logins)
+
+    async def search_users(self, query):
+        """Search for GitHub users by username."""
+        return await self._call(self.api.search_users, query)
+
+    async def follow_user(self, user):
+        """Follow a GitHub user."""
+        return await self._call(self.api.follow_user, user)
+
+    async def unfollow_user(self, user):
+        """Unfollow a GitHub user."""
+        return await self._call(self.api.unfollow_user, user)
+
+    async def star_repo(self, owner, repo):
+        """Star a GitHub repository."""
+        return await self._call(self.api.star_repo, owner, repo)
+
+    async def unstar_repo(self, owner, repo):
+        """Unstar a GitHub repository."""
+        return await self._call(self.api.unstar_repo, owner, repo)
+
+    async def get_following(self):
+        """Get list of users being followed."""
+        return await self._call(self.api.get_following)
+
+    async def get_repos(self, stale_ok=False):
+        """Get list of user repositories."""
+        return await self._call(self.api.get_repos, stale_ok=stale_ok)
+
+    async def create_repo(self, name, desc, private):
+        """Create a new repository."""
+        return await self._call(self.api.create_repo, name, desc, private)
+
+    async def upload_file(self, owner, repo, path, content):
+        """Upload a file to a repository."""
+        return await self._call(self.api.upload_file, owner, repo, path, content)
+
+    async def get_contents(self, owner, repo, path="", stale_ok=False):
+        """Get contents of path within the repository."""
+        return await self._call(self.api.get_contents, owner, repo, path=path, stale_ok=stale_ok)
+
+    async def get_head_sha(self, owner, repo, ref="HEAD"):
+        """Get the commit SHA a branch (by default the default branch) points at."""
+        return await self._call(self.api.get_head_sha, owner, repo, ref=ref)
+
+    async def get_tree(self, owner, repo, sha, recursive=True):
+        """Get the git tree of a commit or tree SHA, including subtrees if recursive."""
+        return await self._call(self.api.get_tree, owner, repo, sha, recursive=recursive)
+
+    async def update_file(self, owner, repo, path, message, new_content, sha):
+        """Update an existing file in a repository."""
+        return await self._call(self.api.update_file, owner, repo, path, message, new_content, sha)
+
+    async def delete_file(self, owner, repo, path, message, sha):
+        """Delete a file in a repository."""
+        return await self._call(self.api.delete_file, owner, repo, path, message, sha)
+
+    async def enable_wiki(self, owner, repo):
+        """Enable wiki for a repository."""
+        return await self._call(self.api.enable_wiki, owner, repo)
+
+    async def disable_wiki(self, owner, repo):
+        """Disable wiki for a repository."""
+        return await self._call(self.api.disable_wiki, owner, repo)
+
+    async def create_branch(self, owner, repo, branch_name, base_sha):
+        """Create a new branch in a repository."""
+        return await self._call(self.api.create_branch, owner, repo, branch_name, base_sha)
+
+    async def delete_branch(self, owner, repo, branch_name):
+        """Delete a branch in a repository."""
+        return await self._call(self.api.delete_branch, owner, repo, branch_name)
+
+    async def update_profile(self, name, bio, company, location, blog):
+        """Update user profile information."""
+        return await self._call(self.api.update_profile, name, bio, company, location, blog)
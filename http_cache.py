@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# Default number of responses kept by the in-memory cache
+DEFAULT_MAX_ENTRIES = 500
+# Default size cap of the on-disk response cache
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+# Seconds a cached response is served without revalidating, by URL fragment
+ENDPOINT_TTLS = (
+    # Trees are requested by SHA, so their content never changes
+    ("/git/trees/", 30 * 24 * 3600),
+    ("/contents/", 300),
+    ("/user/repos", 120),
+    ("/user/following", 120),
+    ("/users/", 600),
+)
+DEFAULT_TTL = 0
+
+
+def cache_dir():
+    """Return (and create) the per-user cache directory for the app."""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    path = os.path.join(base, "github-app")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def ttl_for(url):
+    """Return how long a response for url stays fresh."""
+    for fragment, ttl in ENDPOINT_TTLS:
+        if fragment in url:
+            return ttl
+    return DEFAULT_TTL
+
+
+def is_fresh(entry, url):
+    """Return True if entry can be served for url without revalidation."""
+    return time.time() - entry.get("stored_at", 0) < ttl_for(url)
+
+
+def token_fingerprint(token):
+    """Return a stable, non-reversible identifier for a token."""
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+def cache_key(token, url):
+    """Build the cache key for a URL requested with a given token."""
+    return f"{token_fingerprint(token)} {url}"
+
+
+class CachedResponse:
+    """Minimal stand-in for a requests.Response rebuilt from a cache entry."""
+    from_cache = True
+
+    def __init__(self, entry, headers=None):
+        self.status_code = 200
+        self.content = entry["content"]
+        self.headers = dict(headers) if headers is not None else {}
+        if entry.get("link"):
+            self.headers["Link"] = entry["link"]
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class ResponseCache:
+    """In-memory LRU of validated GET responses for conditional requests.
+
+    Entries are dicts holding the response body along with the ETag and
+    Last-Modified validators needed to revalidate it.
+    """
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """Return the entry stored for key, or None."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        """Store an entry, evicting the least recently used ones if needed."""
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def delete_prefix(self, prefix):
+        """Remove every entry whose key starts with prefix."""
+        with self.lock:
+            for key in [k for k in self.entries if k.startswith(prefix)]:
+                del self.entries[key]
+
+    def clear(self):
+        """Remove every entry."""
+        with self.lock:
+            self.entries.clear()
+
+
+class DiskResponseCache:
+    """SQLite-backed response cache that survives restarts.
+
+    Has the same interface as ResponseCache. Once the stored bodies exceed
+    max_bytes the least recently used entries are evicted.
+    """
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path or os.path.join(cache_dir(), "responses.sqlite3")
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, content BLOB,"
+            " stored_at REAL, accessed_at REAL, size INTEGER, link TEXT)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self.db.commit()
+
+    def get(self, key):
+        """Return the entry stored for key, or None."""
+        with self.lock:
+            row = self.db.execute(
+                "SELECT etag, last_modified, content, stored_at, link FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self.db.commit()
+        etag, last_modified, content, stored_at, link = row
+        return {"etag": etag, "last_modified": last_modified, "content": bytes(content),
+                "stored_at": stored_at, "link": link}
+
+    def set(self, key, entry):
+        """Store an entry and evict least recently used ones past max_bytes."""
+        content = entry["content"]
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO responses"
+                " (key, etag, last_modified, content, stored_at, accessed_at, size, link)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, entry.get("etag"), entry.get("last_modified"), sqlite3.Binary(content),
+                 entry.get("stored_at", time.time()), time.time(), len(content), entry.get("link")),
+            )
+            self._evict()
+            self.db.commit()
+
+    def _evict(self):
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self.db.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+
+    def delete_prefix(self, prefix):
+        """Remove every entry whose key starts with prefix."""
+        with self.lock:
+            self.db.execute("DELETE FROM responses WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+            self.db.commit()
+
+    def clear(self):
+        """Remove every entry."""
+        with self.lock:
+            self.db.execute("DELETE FROM responses")
+            self.db.commit()
+
+
+def make_entry(response):
+    """Build a cache entry from a 200 response, or None if it has no validators."""
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if not etag and not last_modified:
+        return None
+    return {
+        "etag": etag,
+        "last_modified": last_modified,
+        "link": response.headers.get("Link"),
+        "content": response.content,
+        "stored_at": time.time(),
+    }
+
+
+def is_file_content(url, response):
+    """Return True if response is a contents API file rather than a directory listing.
+
+    File bodies are kept in the content-addressed blob cache instead, so
+    identical files are stored once and do not use up the response cache.
+    """
+    return "/contents/" in url and response.content.lstrip()[:1] == b"{"
+
+
+def conditional_headers(headers, entry):
+    """Return a copy of headers with If-None-Match/If-Modified-Since for entry."""
+    headers = dict(headers)
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def shared_response_cache():
+    """Return the process-wide response cache used by GitHubAPI by default.
+
+    This is the on-disk cache, falling back to memory if it cannot be opened.
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            try:
+                _shared_cache = DiskResponseCache()
+            except (OSError, sqlite3.Error):
+                _shared_cache = ResponseCache()
+        return _shared_cache
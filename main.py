@@ -1,25 +1,51 @@
 #!/usr/bin/env python3
+import time
+STARTED = time.perf_counter()
+
 import os
 import sys
+from collections import OrderedDict
 from dotenv import load_dotenv, find_dotenv
-from PyQt5.QtWidgets import QApplication, QMainWindow, QMessageBox, QStackedWidget, QStatusBar, QWidget, QVBoxLayout, QHBoxLayout
-from PyQt5.QtCore import Qt, QSize
+from PyQt5.QtWidgets import QApplication, QMainWindow, QMessageBox, QStackedWidget, QStatusBar, QWidget, QVBoxLayout, QHBoxLayout, QLabel
+from PyQt5.QtCore import Qt, QSize, QTimer
 from PyQt5.QtGui import QColor, QIcon
 
 from github_api import GitHubAPI
+from accounts import account_registry
 from ui_components import (
     DARK_STYLE, AvatarLabel, UserWidget, TokenManagerDialog, LoginWindow,
     MultiTokenDialog, DropArea, MarkdownPreview, ReadmeCreatorTab, ModifiedRepoBrowserTab
 )
 from main_tabs import TitleBar, SidebarWidget, ProfileTab, UsersTab, StarsTab
 
+IMPORTED = time.perf_counter()
+
+# Heavy modules that should only be loaded once a preview is needed
+DEFERRED_MODULES = ("PyQt5.QtWebEngineWidgets", "markdown")
+
+# Attribute name of each tab, in sidebar/stack order
+TAB_ATTRS = ("profile_tab", "users_tab", "stars_tab", "repo_browser_tab", "readme_creator_tab")
+# Accounts whose tabs are kept alive after switching away from them
+MAX_CACHED_ACCOUNTS = 3
+# Upper bound on built tabs kept for inactive accounts, to cap memory use
+MAX_CACHED_TABS = 8
+
+
 class CustomMainWindow(QMainWindow):
-    """Main application window with modern design and improved navigation."""
+    """Main application window with modern design and improved navigation.
+
+    Tabs are built the first time they are shown; until then the content
+    stack holds a lightweight placeholder in their place. When switching
+    accounts the previous account's tabs are kept, so switching back to a
+    recently used account restores them without any requests.
+    """
     def __init__(self, api, user_data, tokens):
         super().__init__()
         self.api = api
         self.user_data = user_data
         self.all_tokens = tokens
+        # token -> (api, user_data, tabs) of recently used accounts, oldest first
+        self.account_tabs = OrderedDict()
         
         
         # Remove standard window decorations
@@ -94,32 +120,17 @@ class CustomMainWindow(QMainWindow):
     
     def refresh_all_tabs(self):
         """Refresh all tabs to ensure they have proper parent references."""
-        if hasattr(self, 'users_tab'):
+        if getattr(self, 'users_tab', None) is not None:
             # Ensure parent_window is set correctly
             self.users_tab.parent_window = self
-        if hasattr(self, 'stars_tab'):
+        if getattr(self, 'stars_tab', None) is not None:
             # Ensure parent_window is set correctly
             self.stars_tab.parent_window = self
 
     def init_tabs(self):
         """Initialize all tabs and sidebar buttons."""
-        # Import tab classes directly from their source files
-        from main_tabs import ProfileTab, UsersTab, StarsTab
-        from ui_components import ReadmeCreatorTab, ModifiedRepoBrowserTab
-        
-        # Create tabs
-        self.profile_tab = ProfileTab(self.api, self.user_data, self)
-        self.users_tab = UsersTab(self.api, self.user_data)
-        self.stars_tab = StarsTab(self.api, self.user_data)
-        self.repo_browser_tab = ModifiedRepoBrowserTab(self.api, self.user_data)
-        self.readme_creator_tab = ReadmeCreatorTab(self.api, self.user_data)
-        
-        # Add tabs to content stack
-        self.content_stack.addWidget(self.profile_tab)        # Index 0
-        self.content_stack.addWidget(self.users_tab)          # Index 1
-        self.content_stack.addWidget(self.stars_tab)          # Index 2
-        self.content_stack.addWidget(self.repo_browser_tab)   # Index 3
-        self.content_stack.addWidget(self.readme_creator_tab) # Index 4
+        # Placeholders for every tab; the real ones are built on first use
+        self.reset_tabs()
         
         # Add section label for main navigation
         self.sidebar.add_section_label("Main")
@@ -144,19 +155,108 @@ class CustomMainWindow(QMainWindow):
         
         # Set default tab
         self.profile_btn.setChecked(True)
-        self.content_stack.setCurrentIndex(0)
+        self.show_tab(0)
+    
+    def create_tab(self, index):
+        """Construct the tab at a stack index."""
+        # Import tab classes directly from their source files
+        from main_tabs import ProfileTab, UsersTab, StarsTab
+        from ui_components import ReadmeCreatorTab, ModifiedRepoBrowserTab
+        
+        if index == 0:
+            return ProfileTab(self.api, self.user_data, self)
+        if index == 1:
+            return UsersTab(self.api, self.user_data, self)
+        if index == 2:
+            return StarsTab(self.api, self.user_data, self)
+        if index == 3:
+            return ModifiedRepoBrowserTab(self.api, self.user_data)
+        return ReadmeCreatorTab(self.api, self.user_data)
+    
+    def create_placeholder(self):
+        """Return the lightweight widget shown until a tab is built."""
+        placeholder = QLabel("Loading...")
+        placeholder.setAlignment(Qt.AlignCenter)
+        placeholder.setStyleSheet("color: #a0a0a0; font-size: 12pt;")
+        return placeholder
+    
+    def reset_tabs(self):
+        """Drop every built tab and put placeholders in their place."""
+        for tab in self.take_tabs():
+            if tab is not None:
+                tab.deleteLater()
+        self.install_tabs([None] * len(TAB_ATTRS))
+    
+    def take_tabs(self):
+        """Remove the tabs from the content stack and return them (None if unbuilt)."""
+        tabs = [getattr(self, attr, None) for attr in TAB_ATTRS]
+        while self.content_stack.count() > 0:
+            widget = self.content_stack.widget(0)
+            self.content_stack.removeWidget(widget)
+            if widget not in tabs:
+                widget.deleteLater()
+        return tabs
+    
+    def install_tabs(self, tabs):
+        """Put tabs into the content stack, with placeholders for unbuilt ones."""
+        for attr, tab in zip(TAB_ATTRS, tabs):
+            setattr(self, attr, tab)
+            self.content_stack.addWidget(tab if tab is not None else self.create_placeholder())
+        self.refresh_all_tabs()
+    
+    def stash_account(self):
+        """Keep the current account's tabs for later, evicting old accounts."""
+        self.account_tabs[self.api.token] = (self.api, self.user_data, self.take_tabs())
+        self.account_tabs.move_to_end(self.api.token)
+        while len(self.account_tabs) > 1 and (
+            len(self.account_tabs) > MAX_CACHED_ACCOUNTS or self.cached_tab_count() > MAX_CACHED_TABS
+        ):
+            _, (_, _, tabs) = self.account_tabs.popitem(last=False)
+            for tab in tabs:
+                if tab is not None:
+                    tab.deleteLater()
+    
+    def cached_tab_count(self):
+        """Return how many built tabs are kept for inactive accounts."""
+        return sum(tab is not None for _, _, tabs in self.account_tabs.values() for tab in tabs)
+    
+    def show_tab(self, index):
+        """Switch to a tab, building it first if it has not been shown yet."""
+        self.content_stack.setCurrentIndex(index)
+        if getattr(self, TAB_ATTRS[index]) is None:
+            # Let the placeholder paint before the tab is constructed
+            QTimer.singleShot(0, lambda: self.ensure_tab(index))
+    
+    def ensure_tab(self, index):
+        """Build the tab at index unless it already exists, and return it."""
+        tab = getattr(self, TAB_ATTRS[index])
+        if tab is not None:
+            return tab
+        tab = self.create_tab(index)
+        setattr(self, TAB_ATTRS[index], tab)
+        
+        # Swap the placeholder for the real tab, keeping the current page
+        current_index = self.content_stack.currentIndex()
+        placeholder = self.content_stack.widget(index)
+        self.content_stack.insertWidget(index, tab)
+        self.content_stack.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.content_stack.setCurrentIndex(current_index)
+        
+        self.refresh_all_tabs()
+        return tab
     
     def on_sidebar_button_clicked(self, button):
         """Handle sidebar button clicks."""
         index = button.property("tab_index")
-        self.content_stack.setCurrentIndex(index)
+        self.show_tab(index)
         
         # Update status bar with current tab info
         tab_titles = [
             f"Profile - {self.user_data.get('login', '')}",
             "Find and manage GitHub users",
             "Star and unstar repositories",
-            f"Browse repository: {self.repo_browser_tab.current_repo if hasattr(self.repo_browser_tab, 'current_repo') else 'None selected'}",
+            f"Browse repository: {getattr(self.repo_browser_tab, 'current_repo', None) or 'None selected'}",
             "Create and edit README files"
         ]
         
@@ -165,8 +265,19 @@ class CustomMainWindow(QMainWindow):
     
     def change_user(self, token, user_data):
         """Change to a different GitHub user."""
+        # Store current tab index
+        current_index = self.content_stack.currentIndex()
+        
+        # Take the new user's cached tabs out first, so stashing the old
+        # user's tabs cannot evict them
+        cached = self.account_tabs.pop(token, None)
+        self.stash_account()
+        if token == self.api.token:
+            # Switching to the same account just puts its tabs back
+            cached = self.account_tabs.pop(token)
+        
         # Update the API and user data
-        self.api = GitHubAPI(token)
+        self.api = cached[0] if cached else GitHubAPI(token)
         self.user_data = user_data
         
         # Update window title
@@ -181,48 +292,37 @@ class CustomMainWindow(QMainWindow):
         # Update status bar
         self.status_bar.showMessage(f"Logged in as {user_data.get('login', '')}")
         
-        # Recreate all tabs with new user data
-        from main_tabs import ProfileTab, UsersTab, StarsTab
-        from ui_components import ReadmeCreatorTab, ModifiedRepoBrowserTab
-        
-        # Store current tab index
-        current_index = self.content_stack.currentIndex()
-        
-        # Remove existing tabs
-        while self.content_stack.count() > 0:
-            self.content_stack.removeWidget(self.content_stack.widget(0))
-        
-        # Create new tabs
-        self.profile_tab = ProfileTab(self.api, self.user_data, self)
-        self.users_tab = UsersTab(self.api, self.user_data, self)
-        self.stars_tab = StarsTab(self.api, self.user_data, self)
-        self.repo_browser_tab = ModifiedRepoBrowserTab(self.api, self.user_data)
-        self.readme_creator_tab = ReadmeCreatorTab(self.api, self.user_data)
-        
-        # Add tabs to content stack
-        self.content_stack.addWidget(self.profile_tab)
-        self.content_stack.addWidget(self.users_tab)
-        self.content_stack.addWidget(self.stars_tab)
-        self.content_stack.addWidget(self.repo_browser_tab)
-        self.content_stack.addWidget(self.readme_creator_tab)
+        # Only the visible tab is built now for an account seen the first time
+        self.install_tabs(cached[2] if cached else [None] * len(TAB_ATTRS))
         
         # Restore current tab
-        self.content_stack.setCurrentIndex(current_index)
+        self.show_tab(current_index)
         
         # Show success message
         QMessageBox.information(self, "User Changed", f"Switched to user: {user_data.get('login', '')}")
     
     def refresh_tokens(self):
         """Reload available tokens."""
-        self.all_tokens = {}
-        load_dotenv(find_dotenv(usecwd=True))
-        for k, v in os.environ.items():
-            if k.startswith("GITHUB_TOKEN_"):
-                self.all_tokens[k[13:]] = v
+        registry = account_registry()
+        registry.load()
+        self.all_tokens = registry.tokens()
+
+
+def print_import_report():
+    """Print startup timings and which heavy modules were loaded early."""
+    now = time.perf_counter()
+    print(f"Module imports: {(IMPORTED - STARTED) * 1000:.0f} ms")
+    print(f"Login window shown: {(now - STARTED) * 1000:.0f} ms")
+    for name in DEFERRED_MODULES:
+        print(f"{name}: {'loaded' if name in sys.modules else 'not loaded'}")
+    print("Run with 'python -X importtime main.py' for a per-module breakdown")
 
 
 def main():
     """Main entry point for the application."""
+    # QtWebEngine is imported lazily, after the application exists
+    QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+    
     # Create application
     app = QApplication(sys.argv)
     app.setStyleSheet(DARK_STYLE)
@@ -244,6 +344,8 @@ def main():
     
     # Show login window
     lw = LoginWindow()
+    if "--import-report" in sys.argv:
+        QTimer.singleShot(0, print_import_report)
     if lw.exec_():
         if lw.selected_token and lw.selected_user:
             # Create main window
@@ -4,7 +4,7 @@ from PyQt5.QtWidgets import (
     QListWidget, QListWidgetItem, QProgressBar, QTextEdit, QLineEdit, QFileDialog,
     QGroupBox, QSplitter, QComboBox, QTreeWidget, QTreeWidgetItem, QMessageBox,
     QInputDialog, QStackedWidget, QButtonGroup, QScrollArea, QPlainTextEdit, QStyle,
-    QApplication
+    QApplication, QListView, QSpinBox
 )
 from PyQt5.QtCore import Qt, pyqtSignal, QSize
 from PyQt5.QtGui import QPainter, QBrush, QPixmap, QColor, QIcon
@@ -12,11 +12,13 @@ import os
 import base64
 
 from github_api import GitHubAPI
-from threads import ActionThread, MultiAccountThread
+from threads import (
+    DEFAULT_WORKERS, MAX_BULK_WORKERS, ActionThread, MultiAccountThread, PageThread, start_thread
+)
 from ui_components import (
     DARK_STYLE, AvatarLabel, UserWidget, TokenManagerDialog, LoginWindow,
     MultiTokenDialog, DropArea, MarkdownPreview, ReadmeCreatorTab, ModifiedRepoBrowserTab,
-    AccountSelector
+    AccountSelector, UserListView
 )
 
 class TitleBar(QWidget):
@@ -236,6 +238,7 @@ class ProfileTab(QWidget):
         self.api = api
         self.user_data = user_data
         self.parent = parent
+        self.following_thread = None
         self.layout = QVBoxLayout(self)
         self.layout.setContentsMargins(20, 20, 20, 20)
         self.layout.setSpacing(20)
@@ -399,20 +402,23 @@ class ProfileTab(QWidget):
         
         following_layout = QVBoxLayout(following_card)
         
-        # Use a scroll area for the following list
-        following_scroll = QScrollArea()
-        following_scroll.setWidgetResizable(True)
-        following_scroll.setMinimumHeight(300)
-        following_scroll.setFrameShape(QScrollArea.NoFrame)
+        # Status line for loading, empty and error states
+        self.following_status = QLabel()
+        self.following_status.setAlignment(Qt.AlignCenter)
+        self.following_status.setVisible(False)
+        following_layout.addWidget(self.following_status)
         
-        # Container for the user widgets
-        self.following_container = QWidget()
-        self.following_list_layout = QVBoxLayout(self.following_container)
-        self.following_list_layout.setAlignment(Qt.AlignTop)
-        self.following_list_layout.setSpacing(10)
+        self.following_retry = QPushButton("Retry")
+        self.following_retry.clicked.connect(self.fetch_following)
+        self.following_retry.setVisible(False)
+        following_layout.addWidget(self.following_retry, 0, Qt.AlignCenter)
         
-        following_scroll.setWidget(self.following_container)
-        following_layout.addWidget(following_scroll)
+        # Virtualized list of followed users
+        self.following_list = UserListView(checkable=False, show_unfollow=True)
+        self.following_list.setMinimumHeight(300)
+        self.following_list.setFrameShape(QListView.NoFrame)
+        self.following_list.unfollow_clicked.connect(self.unfollow_user)
+        following_layout.addWidget(self.following_list)
         
         # Refresh button
         refresh_btn = QPushButton("Refresh Following List")
@@ -499,60 +505,102 @@ class ProfileTab(QWidget):
                 QMessageBox.warning(self, "Error", f"Failed to unfollow: {msg}")
 
     def fetch_following(self):
-        """Fetch and display the list of users being followed."""
-        # Clear existing widgets
-        while self.following_list_layout.count():
-            child = self.following_list_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-        
-        # Add loading indicator
-        loading = QLabel("Loading following list...")
-        loading.setAlignment(Qt.AlignCenter)
-        self.following_list_layout.addWidget(loading)
-        
-        # Fetch following list
-        ok, data = self.api.get_following()
-        
-        # Remove loading indicator
-        if self.following_list_layout.count() > 0:
-            child = self.following_list_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-        
+        """Fetch the list of users being followed, showing each page as it arrives."""
+        # Show loading indicator
+        self.following_list.user_model.clear()
+        self.following_retry.setVisible(False)
+        self.following_status.setText("Loading following list...")
+        self.following_status.setStyleSheet("")
+        self.following_status.setVisible(True)
+        
+        # Pages are fetched on a worker; the next one is requested while the current is shown
+        if self.following_thread is not None:
+            self.following_thread.stop()
+        thread = PageThread(self.api.iter_following(prefetch=True, pages=True))
+        thread.page.connect(lambda users, thread=thread: self.on_following_page(thread, users))
+        thread.done.connect(lambda ok, msg, thread=thread: self.on_following_done(thread, ok, msg))
+        self.following_thread = thread
+        start_thread(thread)
+
+    def on_following_page(self, thread, users):
+        """Append one page of followed users to the list."""
+        if thread is not self.following_thread:
+            return
+        self.following_status.setVisible(False)
+        self.following_list.user_model.append_users([
+            {
+                "login": u["login"],
+                "avatar_url": u["avatar_url"],
+                "info": f"GitHub User • {u.get('type', 'User')}",
+            }
+            for u in users
+        ])
+        self.update_following_count()
+
+    def on_following_done(self, thread, ok, msg):
+        """Show the final state once every page has been fetched."""
+        if thread is not self.following_thread:
+            return
+        self.following_thread = None
         if ok:
-            if len(data) == 0:
+            if self.following_list.user_model.rowCount() == 0:
                 # No users being followed
-                empty = QLabel("You're not following anyone yet.")
-                empty.setAlignment(Qt.AlignCenter)
-                empty.setStyleSheet("color: #a0a0a0; padding: 20px;")
-                self.following_list_layout.addWidget(empty)
-            else:
-                # Add user widgets for each followed user
-                for u in data:
-                    user_widget = UserWidget(
-                        u["login"], 
-                        u["avatar_url"], 
-                        show_check=False,
-                        show_unfollow=True
-                    )
-                    user_widget.unfollow_clicked.connect(self.unfollow_user)
-                    user_widget.label_info.setText(f"GitHub User • {u.get('type', 'User')}")
-                    self.following_list_layout.addWidget(user_widget)
-                
-            # Update following count in groupbox title
-            following_card = self.findChild(QGroupBox, "following_card")
-            if following_card:
-                following_card.setTitle(f"Users You Follow ({len(data)})")
+                self.following_status.setText("You're not following anyone yet.")
+                self.following_status.setStyleSheet("color: #a0a0a0; padding: 20px;")
+                self.following_status.setVisible(True)
+            self.update_following_count()
         else:
-            error_label = QLabel("Failed to fetch following list")
-            error_label.setStyleSheet("color: #ff6060; padding: 20px;")
-            error_label.setAlignment(Qt.AlignCenter)
-            self.following_list_layout.addWidget(error_label)
-            
-            retry_btn = QPushButton("Retry")
-            retry_btn.clicked.connect(self.fetch_following)
-            self.following_list_layout.addWidget(retry_btn, 0, Qt.AlignCenter)
+            self.following_status.setText(f"Failed to fetch following list: {msg}")
+            self.following_status.setStyleSheet("color: #ff6060; padding: 20px;")
+            self.following_status.setVisible(True)
+            self.following_retry.setVisible(True)
+
+    def update_following_count(self):
+        """Show the number of users listed so far in the groupbox title."""
+        following_card = self.findChild(QGroupBox, "following_card")
+        if following_card:
+            following_card.setTitle(f"Users You Follow ({self.following_list.user_model.rowCount()})")
+
+def create_workers_spin():
+    """Spin box choosing how many bulk requests each account sends at once."""
+    spin = QSpinBox()
+    spin.setRange(1, MAX_BULK_WORKERS)
+    spin.setValue(DEFAULT_WORKERS)
+    spin.setPrefix("Parallel: ")
+    spin.setToolTip("Requests each account sends at once during bulk actions.\n"
+                    "GitHub's secondary rate limits penalise concurrent writes, so keep this low.")
+    return spin
+
+def search_result_rows(api, users):
+    """Build list rows for a page of search hits, with details from one batched lookup.
+
+    This does network I/O, so call it off the GUI thread.
+    """
+    info_ok, infos = api.get_users_info([user["login"] for user in users])
+    if not info_ok:
+        infos = {}
+    rows = []
+    for user in users:
+        ud = infos.get(user["login"])
+        s_ok = ud is not None
+        av = ud["avatar_url"] if s_ok and ud["avatar_url"] else user["avatar_url"]
+        info_text = "GitHub User"
+        
+        # Add additional user info if available
+        if s_ok:
+            location = ud.get("location", "")
+            company = ud.get("company", "")
+            if location and company:
+                info_text = f"{user['type']} • {location} • {company}"
+            elif location:
+                info_text = f"{user['type']} • {location}"
+            elif company:
+                info_text = f"{user['type']} • {company}"
+            else:
+                info_text = f"{user['type']}"
+        
+        rows.append({"login": user["login"], "avatar_url": av, "info": info_text})
+    return rows
 
 class UsersTab(QWidget):
     """Tab for finding and managing GitHub users."""
@@ -561,6 +609,7 @@ class UsersTab(QWidget):
         self.api = api
         self.user_data = user_data
         self.parent_window = parent
+        self.search_thread = None
         
         # Main layout with proper scroll area
         layout = QVBoxLayout(self)
@@ -660,6 +709,8 @@ class UsersTab(QWidget):
         action_layout.addWidget(btn_unfollow)
         action_layout.addWidget(btn_multi_follow)
         action_layout.addWidget(btn_multi_unfollow)
+        self.spin_workers = create_workers_spin()
+        action_layout.addWidget(self.spin_workers)
         
         # Add button layouts to search card
         search_layout.addLayout(selection_layout)
@@ -689,28 +740,20 @@ class UsersTab(QWidget):
         results_layout = QVBoxLayout(results_card)
         results_layout.setSpacing(15)
         
-        # User list with fixed styling
-        self.list_users = QListWidget()
+        # Status line for searching and empty results
+        self.search_status = QLabel()
+        self.search_status.setAlignment(Qt.AlignCenter)
+        self.search_status.setVisible(False)
+        
+        # Virtualized user list with fixed styling
+        self.list_users = UserListView(checkable=True)
         self.list_users.setStyleSheet("""
-            QListWidget {
+            QListView {
                 background-color: #1e1e2e;
                 border-radius: 8px;
                 padding: 5px;
                 border: none;
             }
-            QListWidget::item {
-                background-color: transparent;
-                border: none;
-                border-radius: 8px;
-                padding: 2px;
-                margin: 2px;
-            }
-            QListWidget::item:hover {
-                background-color: #2a2a45;
-            }
-            QListWidget::item:selected {
-                background-color: #3a3a5f;
-            }
         """)
         self.list_users.setMinimumHeight(200)
         
@@ -724,7 +767,8 @@ class UsersTab(QWidget):
         self.user_log = QTextEdit()
         self.user_log.setVisible(False)
         
-        # Only add the list to results layout
+        # Only add the status line and list to results layout
+        results_layout.addWidget(self.search_status)
         results_layout.addWidget(self.list_users)
         
         # Add results card to container
@@ -741,25 +785,19 @@ class UsersTab(QWidget):
 
     def select_all_users(self):
         """Select all users in the list."""
-        for i in range(self.list_users.count()):
-            w = self.list_users.itemWidget(self.list_users.item(i))
-            if w:
-                w.check.setChecked(True)
+        self.list_users.user_model.set_all_checked(True)
 
     def deselect_all_users(self):
         """Deselect all users in the list."""
-        for i in range(self.list_users.count()):
-            w = self.list_users.itemWidget(self.list_users.item(i))
-            if w:
-                w.check.setChecked(False)
+        self.list_users.user_model.set_all_checked(False)
+
+    def selected_users(self):
+        """Return the logins of the checked users."""
+        return self.list_users.user_model.checked_logins()
 
     def follow_selected(self):
         """Follow selected users."""
-        selected = []
-        for i in range(self.list_users.count()):
-            w = self.list_users.itemWidget(self.list_users.item(i))
-            if w and w.is_checked():
-                selected.append(w.username)
+        selected = self.selected_users()
         if not selected:
             QMessageBox.warning(self, "No Selection", "Please select at least one user to follow")
             return
@@ -768,18 +806,14 @@ class UsersTab(QWidget):
         self.user_bar.setValue(0)
         self.user_log.append(f"Following {len(selected)} users...")
         
-        self.follow_thread = ActionThread(self.api, 'follow', selected)
+        self.follow_thread = ActionThread(self.api, 'follow', selected, workers=self.spin_workers.value())
         self.follow_thread.progress.connect(self.update_progress)
         self.follow_thread.done.connect(self.operation_completed)
         self.follow_thread.start()
 
     def unfollow_selected(self):
         """Unfollow selected users."""
-        selected = []
-        for i in range(self.list_users.count()):
-            w = self.list_users.itemWidget(self.list_users.item(i))
-            if w and w.is_checked():
-                selected.append(w.username)
+        selected = self.selected_users()
         if not selected:
             QMessageBox.warning(self, "No Selection", "Please select at least one user to unfollow")
             return
@@ -799,18 +833,14 @@ class UsersTab(QWidget):
         self.user_bar.setValue(0)
         self.user_log.append(f"Unfollowing {len(selected)} users...")
         
-        self.unfollow_thread = ActionThread(self.api, 'unfollow', selected)
+        self.unfollow_thread = ActionThread(self.api, 'unfollow', selected, workers=self.spin_workers.value())
         self.unfollow_thread.progress.connect(self.update_progress)
         self.unfollow_thread.done.connect(self.operation_completed)
         self.unfollow_thread.start()
 
     def multi_follow(self):
         """Follow selected users with multiple accounts."""
-        selected = []
-        for i in range(self.list_users.count()):
-            w = self.list_users.itemWidget(self.list_users.item(i))
-            if w and w.is_checked():
-                selected.append(w.username)
+        selected = self.selected_users()
         
         # Get tokens directly from the parent window
         all_tokens = {}
@@ -833,7 +863,8 @@ class UsersTab(QWidget):
             self.user_bar.setValue(0)
             self.user_log.append(f"Following {len(selected)} users with {len(tokens)} accounts...")
             
-            self.mf_thread = MultiAccountThread(tokens, 'follow', selected)
+            self.mf_thread = MultiAccountThread(tokens, 'follow', selected,
+                                                lane_workers=self.spin_workers.value())
             self.mf_thread.progress.connect(self.update_progress)
             self.mf_thread.done.connect(self.operation_completed)
             self.mf_thread.start()
@@ -841,11 +872,7 @@ class UsersTab(QWidget):
     def multi_unfollow(self):
         """Unfollow selected users with multiple accounts."""
         # Same changes as multi_follow
-        selected = []
-        for i in range(self.list_users.count()):
-            w = self.list_users.itemWidget(self.list_users.item(i))
-            if w and w.is_checked():
-                selected.append(w.username)
+        selected = self.selected_users()
                 
         # Get tokens directly from the parent window
         all_tokens = {}
@@ -879,7 +906,8 @@ class UsersTab(QWidget):
             self.user_bar.setValue(0)
             self.user_log.append(f"Unfollowing {len(selected)} users with {len(tokens)} accounts...")
             
-            self.muf_thread = MultiAccountThread(tokens, 'unfollow', selected)
+            self.muf_thread = MultiAccountThread(tokens, 'unfollow', selected,
+                                                 lane_workers=self.spin_workers.value())
             self.muf_thread.progress.connect(self.update_progress)
             self.muf_thread.done.connect(self.operation_completed)
             self.muf_thread.start()
@@ -901,56 +929,51 @@ class UsersTab(QWidget):
             QMessageBox.warning(self, "Empty Search", "Please enter a search query")
             return
             
-        self.list_users.clear()
+        self.list_users.user_model.clear()
         self.user_log.clear()
         self.user_log.append(f"Searching for '{q}'...")
         
         # Add loading indicator
-        loading_item = QListWidgetItem("Searching...")
-        loading_item.setTextAlignment(Qt.AlignCenter)
-        self.list_users.addItem(loading_item)
+        self.search_status.setText("Searching...")
+        self.search_status.setVisible(True)
 
-        ok, res = self.api.search_users(q)
-        
+        # Every page of results is fetched on a worker and shown as it arrives
+        if self.search_thread is not None:
+            self.search_thread.stop()
+        api = self.api
+        thread = PageThread(api.iter_search_users(q, prefetch=True, pages=True),
+                            lambda users: search_result_rows(api, users))
+        thread.page.connect(lambda rows, thread=thread: self.on_search_page(thread, rows))
+        thread.done.connect(lambda ok, msg, thread=thread: self.on_search_done(thread, ok, msg))
+        self.search_thread = thread
+        start_thread(thread)
+
+    def on_search_page(self, thread, rows):
+        """Append one page of search results to the list."""
+        if thread is not self.search_thread:
+            return
         # Remove loading indicator
-        self.list_users.clear()
-        
+        self.search_status.setVisible(False)
+        self.list_users.user_model.append_users(rows)
+
+    def on_search_done(self, thread, ok, msg):
+        """Report the outcome once every page of results has been fetched."""
+        if thread is not self.search_thread:
+            return
+        self.search_thread = None
+        count = self.list_users.user_model.rowCount()
         if ok:
-            if len(res) == 0:
+            if count == 0:
                 # No results
-                no_results = QListWidgetItem("No users found matching your search")
-                no_results.setTextAlignment(Qt.AlignCenter)
-                self.list_users.addItem(no_results)
+                self.search_status.setText("No users found matching your search")
+                self.search_status.setVisible(True)
                 self.user_log.append("No users found")
             else:
-                for user in res:
-                    s_ok, ud = self.api.get_user_info(user["login"])
-                    av = ud["avatar_url"] if s_ok else user["avatar_url"]
-                    item = QListWidgetItem()
-                    uw = UserWidget(user["login"], av, show_check=True)
-                    
-                    # Add additional user info if available
-                    if s_ok:
-                        location = ud.get("location", "")
-                        company = ud.get("company", "")
-                        info_text = user["login"]
-                        if location and company:
-                            info_text = f"{user['type']} • {location} • {company}"
-                        elif location:
-                            info_text = f"{user['type']} • {location}"
-                        elif company:
-                            info_text = f"{user['type']} • {company}"
-                        else:
-                            info_text = f"{user['type']}"
-                        uw.label_info.setText(info_text)
-                    
-                    item.setSizeHint(uw.sizeHint())
-                    self.list_users.addItem(item)
-                    self.list_users.setItemWidget(item, uw)
-                self.user_log.append(f"Found {len(res)} users")
+                self.user_log.append(f"Found {count} users")
         else:
-            self.user_log.append(f"Error: {res}")
-            QMessageBox.warning(self, "Search Error", f"Failed to search for users: {res}")
+            self.search_status.setVisible(False)
+            self.user_log.append(f"Error: {msg}")
+            QMessageBox.warning(self, "Search Error", f"Failed to search for users: {msg}")
 
 class StarsTab(QWidget):
     """Tab for starring GitHub repositories."""
@@ -1049,6 +1072,8 @@ class StarsTab(QWidget):
         btn_row.addWidget(unstar_btn)
         btn_row.addWidget(multi_star_btn)
         btn_row.addWidget(multi_unstar_btn)
+        self.spin_workers = create_workers_spin()
+        btn_row.addWidget(self.spin_workers)
         btn_row.addWidget(clr_btn)
 
         repo_layout.addLayout(btn_row)
@@ -1119,7 +1144,7 @@ class StarsTab(QWidget):
         self.repo_bar.setValue(0)
         self.repo_log.append(f"Starring {len(lines)} repositories...")
         
-        self.star_thread = ActionThread(self.api, 'star', lines)
+        self.star_thread = ActionThread(self.api, 'star', lines, workers=self.spin_workers.value())
         self.star_thread.progress.connect(self.update_progress)
         self.star_thread.done.connect(self.operation_completed)
         self.star_thread.start()
@@ -1145,7 +1170,7 @@ class StarsTab(QWidget):
         self.repo_bar.setValue(0)
         self.repo_log.append(f"Unstarring {len(lines)} repositories...")
         
-        self.unstar_thread = ActionThread(self.api, 'unstar', lines)
+        self.unstar_thread = ActionThread(self.api, 'unstar', lines, workers=self.spin_workers.value())
         self.unstar_thread.progress.connect(self.update_progress)
         self.unstar_thread.done.connect(self.operation_completed)
         self.unstar_thread.start()
@@ -1174,7 +1199,8 @@ class StarsTab(QWidget):
             self.repo_bar.setValue(0)
             self.repo_log.append(f"Starring {len(lines)} repositories with {len(tokens)} accounts...")
             
-            self.ms_thread = MultiAccountThread(tokens, 'star', lines)
+            self.ms_thread = MultiAccountThread(tokens, 'star', lines,
+                                                lane_workers=self.spin_workers.value())
             self.ms_thread.progress.connect(self.update_progress)
             self.ms_thread.done.connect(self.operation_completed)
             self.ms_thread.start()
@@ -1214,7 +1240,8 @@ class StarsTab(QWidget):
             self.repo_bar.setValue(0)
             self.repo_log.append(f"Unstarring {len(lines)} repositories with {len(tokens)} accounts...")
             
-            self.mus_thread = MultiAccountThread(tokens, 'unstar', lines)
+            self.mus_thread = MultiAccountThread(tokens, 'unstar', lines,
+                                                 lane_workers=self.spin_workers.value())
             self.mus_thread.progress.connect(self.update_progress)
             self.mus_thread.done.connect(self.operation_completed)
             self.mus_thread.start()
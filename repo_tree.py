@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+import base64
+
+from blob_cache import blob_cache
+
+# Only files up to this size are prefetched
+PREFETCH_FILE_BYTES = 64 * 1024
+# Files most likely to be opened after entering a directory
+PREFETCH_NAMES = ("readme.md", "readme", "readme.rst", "readme.txt")
+
+
+class RepoTree:
+    """In-memory path index of a repository tree from the Git Trees API.
+
+    Built from the entries of GET /git/trees/{sha}?recursive=1 so that
+    directories can be listed without further requests. Listed items have
+    the same name/path/sha/size/type keys as the contents API.
+    """
+    def __init__(self, sha, entries):
+        self.sha = sha
+        self.items = {}
+        self.children = {"": []}
+        for entry in entries:
+            path = entry["path"]
+            parent, _, name = path.rpartition("/")
+            if entry["type"] == "tree":
+                kind = "dir"
+            elif entry["type"] == "commit":
+                kind = "submodule"
+            else:
+                kind = "file"
+            item = {
+                "name": name,
+                "path": path,
+                "sha": entry["sha"],
+                "size": entry.get("size", 0),
+                "type": kind,
+            }
+            self.items[path] = item
+            self.children.setdefault(parent, []).append(item)
+            if kind == "dir":
+                self.children.setdefault(path, [])
+
+    def list_dir(self, path=""):
+        """Return the items directly inside path, or None if it is not a directory."""
+        return self.children.get(path.strip("/"))
+
+    def files_under(self, path):
+        """Return every file below a directory, at any depth."""
+        prefix = path.strip("/") + "/"
+        return [item for p, item in self.items.items() if p.startswith(prefix) and item["type"] == "file"]
+
+
+def load_tree(api, owner, repo, tree=None):
+    """Return the RepoTree of a repository's default branch head.
+
+    tree is returned unchanged if the head still points at its SHA.
+    Returns None if the tree is unavailable or truncated. This does
+    network I/O, so call it off the GUI thread.
+    """
+    ok, sha = api.get_head_sha(owner, repo)
+    if not ok:
+        return None
+    if tree is not None and tree.sha == sha:
+        return tree
+    ok, data = api.get_tree(owner, repo, sha)
+    if ok and isinstance(data, dict) and not data.get("truncated"):
+        return RepoTree(sha, data.get("tree", []))
+    return None
+
+
+def load_listing(api, owner, repo, path, tree=None):
+    """Return (tree, ok, items) for a directory, refreshing the tree first.
+
+    Without a usable tree the directory is listed through the contents API
+    and the returned tree is None. Errors are returned as
+    (None, False, message) rather than raised.
+    """
+    try:
+        tree = load_tree(api, owner, repo, tree)
+        if tree is not None:
+            return tree, True, tree.list_dir(path) or []
+        ok, content = api.get_contents(owner, repo, path, stale_ok=True)
+        return None, ok, content
+    except Exception as e:
+        return None, False, str(e)
+
+
+def list_files(api, owner, repo, path, tree=None):
+    """Return (ok, files) for every file below a directory, at any depth.
+
+    Uses the repository tree when there is one; otherwise the directory is
+    walked through the contents API, one request per subdirectory.
+    """
+    if tree is not None:
+        return True, tree.files_under(path)
+    ok, contents = api.get_contents(owner, repo, path)
+    if not ok:
+        return False, contents
+    if not isinstance(contents, list):
+        contents = [contents]
+    files = []
+    for item in contents:
+        if item["type"] == "dir":
+            ok, sub = list_files(api, owner, repo, item["path"])
+            if not ok:
+                return False, sub
+            files += sub
+        else:
+            files.append(item)
+    return True, files
+
+
+def prefetch_candidates(items, tree=None):
+    """Return (files, dirs) worth prefetching after listing a directory.
+
+    READMEs of the directory come first, then those of its
+    subdirectories when the tree is known, then other small files. dirs
+    lists the subdirectories that would still need a request to list.
+    """
+    def small(item):
+        return (item["type"] == "file" and item.get("sha")
+                and 0 < item.get("size", 0) <= PREFETCH_FILE_BYTES)
+
+    dirs = [item for item in items if item["type"] == "dir"]
+    readmes = [item for item in items if small(item) and item["name"].lower() in PREFETCH_NAMES]
+    if tree is not None:
+        for d in dirs:
+            readmes += [item for item in tree.list_dir(d["path"]) or []
+                        if small(item) and item["name"].lower() in PREFETCH_NAMES]
+    others = sorted((item for item in items if small(item) and item not in readmes),
+                    key=lambda item: item["size"])
+    return readmes + others, [] if tree is not None else dirs
+
+
+def prefetch_file(api, owner, repo, item, budget):
+    """Download a small file into the blob cache if the budget allows."""
+    if blob_cache().get(item["sha"]) is not None or not budget.take(item.get("size", 0)):
+        return
+    ok, res = api.get_contents(owner, repo, item["path"])
+    if ok and isinstance(res, dict) and res.get("content"):
+        blob_cache().set(res["sha"], base64.b64decode(res["content"]))
+
+
+def prefetch_listing(api, owner, repo, path, budget):
+    """Warm the response cache with a directory listing if the budget allows."""
+    if budget.take(0):
+        api.get_contents(owner, repo, path, stale_ok=True)
@@ -1,42 +1,140 @@
 #!/usr/bin/env python3
-from PyQt5.QtCore import QThread, pyqtSignal
-from github_api import GitHubAPI
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, QThread, QTimer, pyqtSignal
+from github_api import GitHubAPI, GitHubAPIError, ThreadedGitHubAPI
+
+# Requests each account has in flight during a bulk run. Follow and star
+# calls are writes, which GitHub's secondary rate limits penalise when sent
+# concurrently, so callers have to opt in to more than one.
+DEFAULT_WORKERS = 1
+# Upper bound offered in the UI for requests in flight per account
+MAX_BULK_WORKERS = 8
+# Workers shared by every TaskRunner
+TASK_WORKERS = 4
+# Quiet period before an IdleQueue starts its next job
+IDLE_DELAY_MS = 300
+
+_task_executor = ThreadPoolExecutor(max_workers=TASK_WORKERS)
+# Low-priority work runs one job at a time, apart from user-initiated calls
+_idle_executor = ThreadPoolExecutor(max_workers=1)
+# QThreads started through start_thread, kept alive until they finish
+_running_threads = set()
+
+
+def start_thread(thread):
+    """Start a QThread, holding a reference to it until it has finished."""
+    _running_threads.add(thread)
+    thread.finished.connect(lambda: _running_threads.discard(thread))
+    thread.start()
+    return thread
+
+
+def _operation_call(api, operation, elem):
+    """Invoke the API method for an operation; works with GitHubAPI and ThreadedGitHubAPI."""
+    if operation == 'follow':
+        return api.follow_user(elem)
+    elif operation == 'unfollow':
+        return api.unfollow_user(elem)
+    elif operation in ('star', 'unstar'):
+        parts = elem.split('/')
+        if len(parts) >= 2:
+            owner, repo = parts[-2], parts[-1]
+            if operation == 'star':
+                return api.star_repo(owner, repo)
+            return api.unstar_repo(owner, repo)
+    return None
+
+
+def perform_operation(api, operation, elem):
+    """Perform a single bulk operation item with a blocking client."""
+    result = _operation_call(api, operation, elem)
+    return result if result is not None else (False, "")
+
+
+async def perform_operation_async(api, operation, elem):
+    """Perform a single bulk operation item with a ThreadedGitHubAPI client."""
+    call = _operation_call(api, operation, elem)
+    if call is None:
+        return False, ""
+    return await call
+
+
+def summary_message(success, total, retried=0):
+    """Build the completion message for a bulk run."""
+    message = f"Completed {success}/{total} operations"
+    if retried or success < total:
+        message += f" ({retried} retried, {total - success} failed)"
+    return message
+
+
+async def iter_operations_async(api, operation, items, concurrency):
+    """Yield (ok, msg) for each item in input order, running up to `concurrency` at once."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_one(elem):
+        async with semaphore:
+            return await perform_operation_async(api, operation, elem)
+
+    tasks = [asyncio.ensure_future(run_one(elem)) for elem in items]
+    try:
+        for task in tasks:
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+
 
 class ActionThread(QThread):
     """Thread for performing GitHub API actions on multiple items."""
     progress = pyqtSignal(int, str)
     done = pyqtSignal(bool, str)
 
-    def __init__(self, api, operation, items):
+    def __init__(self, api, operation, items, workers=DEFAULT_WORKERS):
         super().__init__()
-        self.api = api
+        # Bulk runs wait out rate limits instead of failing fast
+        self.api = api.with_max_wait(None)
         self.operation = operation
         self.items = items
+        self.workers = workers
 
     def run(self):
+        before = self.api.retry_stats.snapshot()
+        if self.workers > 1 and len(self.items) > 1:
+            success = asyncio.run(self.run_concurrent())
+        else:
+            success = self.run_serial()
+        retried = self.api.retry_stats.snapshot()["retried"] - before["retried"]
+        self.done.emit(True, summary_message(success, len(self.items), retried))
+
+    def run_serial(self):
+        """Perform the operations one at a time."""
         total = len(self.items)
         success = 0
         for i, elem in enumerate(self.items, start=1):
-            msg = ""
-            ok = False
-            if self.operation == 'follow':
-                ok, msg = self.api.follow_user(elem)
-            elif self.operation == 'unfollow':
-                ok, msg = self.api.unfollow_user(elem)
-            elif self.operation == 'star':
-                parts = elem.split('/')
-                if len(parts) >= 2:
-                    owner, repo = parts[-2], parts[-1]
-                    ok, msg = self.api.star_repo(owner, repo)
-            elif self.operation == 'unstar':
-                parts = elem.split('/')
-                if len(parts) >= 2:
-                    owner, repo = parts[-2], parts[-1]
-                    ok, msg = self.api.unstar_repo(owner, repo)
+            ok, msg = perform_operation(self.api, self.operation, elem)
             self.progress.emit(int(i / total * 100), msg)
             if ok:
                 success += 1
-        self.done.emit(True, f"Completed {success}/{total} operations")
+        return success
+
+    async def run_concurrent(self):
+        """Perform the operations with up to `workers` requests in flight."""
+        total = len(self.items)
+        success = 0
+        client = ThreadedGitHubAPI.from_api(self.api, max_workers=self.workers)
+        try:
+            i = 0
+            async for ok, msg in iter_operations_async(client, self.operation, self.items, self.workers):
+                i += 1
+                self.progress.emit(int(i / total * 100), msg)
+                if ok:
+                    success += 1
+        finally:
+            client.close()
+        return success
 
 
 class MultiAccountThread(QThread):
@@ -44,37 +142,235 @@ class MultiAccountThread(QThread):
     progress = pyqtSignal(int, str)
     done = pyqtSignal(bool, str)
 
-    def __init__(self, tokens, operation, items):
+    def __init__(self, tokens, operation, items, lane_workers=DEFAULT_WORKERS):
         super().__init__()
         self.tokens = tokens
         self.operation = operation
         self.items = items
+        # Requests each account may have in flight; accounts always run in parallel
+        self.lane_workers = lane_workers
+        self.total_ops = 0
+        self.done_count = 0
+        self.retried = 0
 
     def run(self):
-        total_ops = len(self.tokens) * len(self.items)
-        done_count = 0
+        self.total_ops = len(self.tokens) * len(self.items)
+        self.done_count = 0
+        self.retried = 0
+        if self.total_ops:
+            success = asyncio.run(self.run_lanes())
+        else:
+            success = 0
+        self.done.emit(True, summary_message(success, self.total_ops, self.retried))
+
+    async def run_lanes(self):
+        """Run one lane per token concurrently and return the combined success count."""
+        results = await asyncio.gather(*(self.run_lane(token) for token in self.tokens))
+        return sum(results)
+
+    async def run_lane(self, token):
+        """Perform every item with a single account."""
         success = 0
-        for token in self.tokens:
-            api = GitHubAPI(token)
-            for elem in self.items:
-                msg = ""
-                ok = False
-                if self.operation == 'follow':
-                    ok, msg = api.follow_user(elem)
-                elif self.operation == 'unfollow':
-                    ok, msg = api.unfollow_user(elem)
-                elif self.operation == 'star':
-                    parts = elem.split('/')
-                    if len(parts) >= 2:
-                        owner, repo = parts[-2], parts[-1]
-                        ok, msg = api.star_repo(owner, repo)
-                elif self.operation == 'unstar':
-                    parts = elem.split('/')
-                    if len(parts) >= 2:
-                        owner, repo = parts[-2], parts[-1]
-                        ok, msg = api.unstar_repo(owner, repo)
-                done_count += 1
-                self.progress.emit(int(done_count / total_ops * 100), msg)
+        client = ThreadedGitHubAPI(token, max_workers=max(1, self.lane_workers),
+                                   api=GitHubAPI(token, max_wait=None))
+        try:
+            async for ok, msg in iter_operations_async(client, self.operation, self.items, self.lane_workers):
+                self.done_count += 1
+                self.progress.emit(int(self.done_count / self.total_ops * 100), msg)
                 if ok:
                     success += 1
-        self.done.emit(True, f"Completed {success}/{total_ops} operations")
\ No newline at end of file
+        finally:
+            self.retried += client.retry_stats.snapshot()["retried"]
+            client.close()
+        return success
+
+
+class PageThread(QThread):
+    """Thread that walks a paginated API iterator, emitting each page as it arrives.
+
+    An optional transform is applied to every page on the thread, e.g. to
+    look up extra details before the page reaches the GUI.
+    """
+    page = pyqtSignal(object)  # list of items
+    done = pyqtSignal(bool, str)  # ok, error message
+
+    def __init__(self, pages, transform=None):
+        super().__init__()
+        self.pages = pages
+        self.transform = transform
+        self.stopped = False
+
+    def stop(self):
+        """Stop after the page currently being fetched."""
+        self.stopped = True
+
+    def run(self):
+        try:
+            for items in self.pages:
+                if self.stopped:
+                    return
+                if self.transform is not None:
+                    items = self.transform(items)
+                self.page.emit(items)
+        except GitHubAPIError as e:
+            self.done.emit(False, f"Error {e.status_code}")
+            return
+        except Exception as e:
+            self.done.emit(False, str(e))
+            return
+        self.done.emit(True, "")
+
+
+class BlobDownloadThread(QThread):
+    """Thread that streams a large git blob to a local file."""
+    progress = pyqtSignal(int, int)  # bytes done, total bytes (0 if unknown)
+    done = pyqtSignal(bool, str)  # ok, file path or error message
+
+    def __init__(self, api, owner, repo, sha, dest):
+        super().__init__()
+        self.api = api
+        self.owner = owner
+        self.repo = repo
+        self.sha = sha
+        self.dest = dest
+
+    def run(self):
+        ok, res = self.api.download_blob(self.owner, self.repo, self.sha, self.dest, self.progress.emit)
+        self.done.emit(ok, res)
+
+
+class TaskRunner(QObject):
+    """Run blocking calls on a shared worker pool, delivering results on the GUI thread.
+
+    Every call belongs to a channel such as "dir" or "file". Starting a
+    call makes earlier calls on the same channel stale: they are skipped
+    if they have not started yet, and their results are dropped.
+    """
+    finished = pyqtSignal(str, int, object)  # channel, request token, result
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.tokens = {}
+        self.callbacks = {}
+        self.finished.connect(self.on_finished)
+
+    def run(self, channel, callback, func, *args, **kwargs):
+        """Call func(*args, **kwargs) on a worker and later callback(result).
+
+        Exceptions are turned into a (False, message) result.
+        """
+        token = self.cancel(channel)
+        self.callbacks[(channel, token)] = callback
+        _task_executor.submit(self._call, channel, token, func, args, kwargs)
+        return token
+
+    def cancel(self, channel):
+        """Make every pending call on channel stale and return the new token."""
+        self.tokens[channel] = self.tokens.get(channel, 0) + 1
+        return self.tokens[channel]
+
+    def is_current(self, channel, token):
+        """Return True if token is the latest request on channel."""
+        return self.tokens.get(channel) == token
+
+    def busy(self):
+        """Return True while any call is still in flight."""
+        return bool(self.callbacks)
+
+    def _call(self, channel, token, func, args, kwargs):
+        result = None
+        if self.is_current(channel, token):
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                result = (False, str(e))
+        try:
+            self.finished.emit(channel, token, result)
+        except RuntimeError:
+            # The owning widget was deleted while the call was running
+            pass
+
+    def on_finished(self, channel, token, result):
+        """Hand a result to its callback unless a newer request replaced it."""
+        callback = self.callbacks.pop((channel, token), None)
+        if callback is not None and self.is_current(channel, token):
+            callback(result)
+
+
+class PrefetchBudget:
+    """Byte and request allowance for speculative downloads."""
+    def __init__(self, max_bytes, max_requests):
+        self.max_bytes = max_bytes
+        self.max_requests = max_requests
+        self.bytes = 0
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def take(self, size):
+        """Reserve one request of size bytes, returning False once exhausted."""
+        with self.lock:
+            if self.requests >= self.max_requests or self.bytes + size > self.max_bytes:
+                return False
+            self.requests += 1
+            self.bytes += size
+            return True
+
+
+class IdleQueue(QObject):
+    """Low-priority jobs run one at a time while a TaskRunner is idle.
+
+    A job only starts once the runner has had no call in flight for
+    IDLE_DELAY_MS, so user-initiated requests always go first.
+    """
+    job_done = pyqtSignal()
+
+    def __init__(self, runner, parent=None):
+        super().__init__(parent)
+        self.runner = runner
+        self.jobs = deque()
+        self.running = False
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(IDLE_DELAY_MS)
+        self.timer.timeout.connect(self.run_next)
+        self.job_done.connect(self.on_job_done)
+        # User activity pushes the next job back
+        runner.finished.connect(self.schedule)
+
+    def add(self, func, *args):
+        """Queue func(*args) to run on the idle worker."""
+        self.jobs.append((func, args))
+        self.schedule()
+
+    def clear(self):
+        """Drop every job that has not started yet."""
+        self.jobs.clear()
+
+    def schedule(self, *args):
+        if self.jobs and not self.running:
+            self.timer.start()
+
+    def run_next(self):
+        if self.running or not self.jobs:
+            return
+        if self.runner.busy():
+            self.timer.start()
+            return
+        func, args = self.jobs.popleft()
+        self.running = True
+        _idle_executor.submit(self._call, func, args)
+
+    def _call(self, func, args):
+        try:
+            func(*args)
+        except Exception:
+            pass
+        try:
+            self.job_done.emit()
+        except RuntimeError:
+            # The owning widget was deleted while the job was running
+            pass
+
+    def on_job_done(self):
+        self.running = False
+        self.schedule()
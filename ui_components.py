@@ -1,7 +1,5 @@
 #!/usr/bin/env python3
 import os
-import requests
-import markdown
 import re
 import base64
 from dotenv import load_dotenv, set_key, find_dotenv
@@ -10,12 +8,24 @@ from PyQt5.QtWidgets import (
     QLabel, QPushButton, QListWidget, QListWidgetItem, QCheckBox, QProgressBar,
     QTextEdit, QLineEdit, QFileDialog, QGroupBox, QSplitter, QComboBox, QTreeWidget,
     QTreeWidgetItem, QMessageBox, QInputDialog, QStackedWidget, QButtonGroup,
-    QScrollArea, QPlainTextEdit, QStyle
+    QScrollArea, QPlainTextEdit, QStyle, QApplication, QListView, QStyledItemDelegate, QStyleOptionButton,
+    QAbstractItemView
 )
-from PyQt5.QtCore import Qt, pyqtSignal, QRect, QPoint, QMimeData, QUrl
-from PyQt5.QtGui import QPainter, QBrush, QPixmap, QColor, QIcon, QDragEnterEvent, QDropEvent
-from PyQt5.QtWebEngineWidgets import QWebEngineView
+from PyQt5.QtCore import (
+    Qt, pyqtSignal, QRect, QPoint, QMimeData, QUrl, QSize, QEvent, QAbstractListModel,
+    QModelIndex, QTimer
+)
+from PyQt5.QtGui import QPainter, QBrush, QPixmap, QColor, QIcon, QDragEnterEvent, QDropEvent, QFont, QTextCursor
 from github_api import GitHubAPI
+from avatars import PREFETCH_PRIORITY, VISIBLE_PRIORITY, avatar_service
+from accounts import account_registry, validate_identity
+from repo_tree import list_files, load_listing, load_tree, prefetch_candidates, prefetch_file, prefetch_listing
+from blob_cache import INLINE_CONTENT_LIMIT, blob_cache, blob_file_path, iter_text_chunks
+from threads import BlobDownloadThread, IdleQueue, PrefetchBudget, TaskRunner, start_thread
+
+# Bytes and requests the repo browser may spend prefetching per repository
+PREFETCH_BUDGET_BYTES = 2 * 1024 * 1024
+PREFETCH_MAX_REQUESTS = 30
 
 # Modern dark style with improved visual hierarchy
 DARK_STYLE = """
@@ -277,31 +287,40 @@ class AvatarLabel(QLabel):
         self.setStyleSheet("font-size: 24pt; color: #a0a0ff; background: #3f3f5f; border-radius: 20px;")
         # Set default avatar
         self.setText("👤")
+        self.avatar_url = ""
     
     def set_avatar(self, url):
-        """Load and display an avatar from a URL with rounded corners."""
+        """Load and display an avatar from a URL with rounded corners.
+
+        The download happens on the shared AvatarService; the placeholder is
+        shown until the avatar arrives.
+        """
+        self.avatar_url = url
         if not url:
-            self.setText("👤")
+            self.show_placeholder()
             return
-            
-        try:
-            px = QPixmap()
-            px.loadFromData(requests.get(url).content)
-            round_px = QPixmap(px.size())
-            round_px.fill(Qt.transparent)
-            painter = QPainter(round_px)
-            painter.setRenderHint(QPainter.Antialiasing)
-            painter.setBrush(QBrush(px))
-            painter.setPen(Qt.NoPen)
-            painter.drawEllipse(0, 0, px.width(), px.height())
-            painter.end()
-            scaled = round_px.scaled(self.width(), self.height(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            self.setPixmap(scaled)
-        except:
-            # Set a default placeholder if avatar can't be loaded
-            self.setText("👤")
-            self.setAlignment(Qt.AlignCenter)
-            self.setStyleSheet("font-size: 24pt; color: #a0a0ff; background: #3f3f5f; border-radius: 20px;")
+
+        # Request the exact device-pixel size so GitHub downscales server-side
+        scale = self.devicePixelRatioF()
+        pixels = max(1, round(min(self.width(), self.height()) * scale))
+        avatar_service().request(url, pixels, lambda px, url=url: self.on_avatar_loaded(url, px, scale))
+
+    def on_avatar_loaded(self, url, pixmap, scale=1.0):
+        """Show a loaded avatar if it is still the one this label wants."""
+        if url != self.avatar_url:
+            return
+        if pixmap is None:
+            self.show_placeholder()
+        else:
+            pixmap = QPixmap(pixmap)
+            pixmap.setDevicePixelRatio(scale)
+            self.setPixmap(pixmap)
+
+    def show_placeholder(self):
+        """Show the default placeholder avatar."""
+        self.setText("👤")
+        self.setAlignment(Qt.AlignCenter)
+        self.setStyleSheet("font-size: 24pt; color: #a0a0ff; background: #3f3f5f; border-radius: 20px;")
 
 class AccountSelector(QComboBox):
     """Custom combobox for selecting GitHub accounts with built-in token management."""
@@ -320,35 +339,36 @@ class AccountSelector(QComboBox):
             }
         """)
         self.all_tokens = {}
-        self.load_tokens()
+        self.registry = account_registry()
+        self.registry.accounts_reloaded.connect(self.show_accounts)
+        self.registry.account_changed.connect(self.show_accounts)
+        self.registry.ensure_loaded()
+        self.show_accounts()
         
         # Connect signal
         self.currentIndexChanged.connect(self.on_index_changed)
         
     def load_tokens(self):
-        """Load tokens from environment."""
+        """Reload tokens from the environment."""
+        self.registry.load()
+
+    def show_accounts(self, *args):
+        """Rebuild the list from the account registry, keeping the selection."""
+        current = self.itemData(self.currentIndex(), Qt.UserRole) if self.count() else None
+        self.blockSignals(True)
         self.clear()
-        self.all_tokens = {}
-        
-        # Load .env file
-        from dotenv import load_dotenv, find_dotenv
-        load_dotenv(find_dotenv(usecwd=True))
-        
-        # Get all tokens
-        for k, v in os.environ.items():
-            if k.startswith("GITHUB_TOKEN_"):
-                name = k[13:]  # Remove "GITHUB_TOKEN_" prefix
-                self.all_tokens[name] = v
-                
-                # Validate token and get user data
-                api = GitHubAPI(v)
-                ok, user_data = api.validate_token()
-                
-                if ok and isinstance(user_data, dict):
-                    display_name = f"{name} ({user_data.get('login', 'Unknown')})"
-                    # Store user data with the token
-                    self.addItem(display_name)
-                    self.setItemData(self.count()-1, (v, user_data), Qt.UserRole)
+        self.all_tokens = self.registry.tokens()
+        
+        for name, entry in self.registry.items():
+            user_data = entry["user"]
+            if entry["status"] == "valid" and isinstance(user_data, dict):
+                display_name = f"{name} ({user_data.get('login', 'Unknown')})"
+                # Store user data with the token
+                self.addItem(display_name)
+                self.setItemData(self.count()-1, (entry["token"], user_data), Qt.UserRole)
+                if current and current[0] == entry["token"]:
+                    self.setCurrentIndex(self.count()-1)
+        self.blockSignals(False)
                     
     def on_index_changed(self, index):
         """Handle change of selected account."""
@@ -553,6 +573,15 @@ class ModifiedRepoBrowserTab(QWidget):
         self.current_path = ""
         self.current_repo = ""
         self.path_history = []
+        # Path index of the whole repository; None falls back to per-directory requests
+        self.repo_tree = None
+        # Network calls run in the background; a new request on a channel supersedes older ones
+        self.tasks = TaskRunner(self)
+        # Idle-time prefetching of what is likely to be opened next, per repository budget
+        self.prefetch_budget_bytes = PREFETCH_BUDGET_BYTES
+        self.prefetch_max_requests = PREFETCH_MAX_REQUESTS
+        self.prefetch_budget = PrefetchBudget(self.prefetch_budget_bytes, self.prefetch_max_requests)
+        self.prefetch = IdleQueue(self.tasks, self)
 
         # Repository selection section with Create New button (not including search/replace anymore)
         top_row = QHBoxLayout()
@@ -565,12 +594,12 @@ class ModifiedRepoBrowserTab(QWidget):
         self.cmb_repos.currentIndexChanged.connect(self.on_repo_changed)
         
         # Add Create Repository button next to dropdown
-        btn_create_repo = QPushButton("Create Repo")
-        btn_create_repo.clicked.connect(self.show_create_repo_dialog)
+        self.btn_create_repo = QPushButton("Create Repo")
+        self.btn_create_repo.clicked.connect(self.show_create_repo_dialog)
         
         # Add repo controls to top row
         top_row.addWidget(self.cmb_repos)
-        top_row.addWidget(btn_create_repo)
+        top_row.addWidget(self.btn_create_repo)
         top_row.addStretch()
         
         # Main content area
@@ -646,13 +675,13 @@ class ModifiedRepoBrowserTab(QWidget):
         self.drop_area.fileDrop.connect(self.handle_file_drop)
         
         # Add browse button to drop area
-        browse_btn = QPushButton("Browse Files")
-        browse_btn.clicked.connect(self.browse_files)
+        self.btn_browse = QPushButton("Browse Files")
+        self.btn_browse.clicked.connect(self.browse_files)
         
         left_layout.addWidget(self.tree_files)
         left_layout.addLayout(button_layout)
         left_layout.addWidget(self.drop_area)
-        left_layout.addWidget(browse_btn)
+        left_layout.addWidget(self.btn_browse)
         
         # Right side - editor and preview
         right_widget = QWidget()
@@ -729,6 +758,14 @@ class ModifiedRepoBrowserTab(QWidget):
         
         right_layout.addWidget(self.editor_preview_splitter)
         
+        # Download progress for files too large for the contents API
+        self.file_progress = QProgressBar()
+        self.file_progress.setVisible(False)
+        right_layout.addWidget(self.file_progress)
+        # Running blob downloads by SHA, and the large file the editor is waiting for
+        self.blob_downloads = {}
+        self.loading_file = None
+        
         # Add widgets to main splitter
         main_splitter.addWidget(left_widget)
         main_splitter.addWidget(right_widget)
@@ -746,6 +783,8 @@ class ModifiedRepoBrowserTab(QWidget):
         self.selected_path = ""
         self.current_file_type = "text"
         self.selected_folder = None
+        self.writing = False
+        self.update_file_actions()
         
         # Load repos
         self.load_user_repos()
@@ -832,16 +871,18 @@ class ModifiedRepoBrowserTab(QWidget):
                 path += "/"
             path += filename
             
-            # Empty content
-            content = ""
-            
-            # Upload file
-            success, msg = self.api.upload_file(owner, repo_name, path, content.encode('utf-8'))
-            if success:
-                QMessageBox.information(self, "Success", f"File '{filename}' created successfully")
-                self.load_directory_contents()
-            else:
-                QMessageBox.warning(self, "Error", f"Failed to create file: {msg}")
+            # Upload the empty file in the background
+            self.run_write(lambda result: self.on_file_created(filename, result),
+                           self.api.upload_file, owner, repo_name, path, b"")
+
+    def on_file_created(self, filename, result):
+        """Report the outcome of creating a file."""
+        success, msg = result
+        if success:
+            QMessageBox.information(self, "Success", f"File '{filename}' created successfully")
+            self.load_directory_contents(refresh=True)
+        else:
+            QMessageBox.warning(self, "Error", f"Failed to create file: {msg}")
     
     def delete_current_folder(self):
         """Delete the selected folder."""
@@ -866,36 +907,34 @@ class ModifiedRepoBrowserTab(QWidget):
             self.recursive_delete_folder(folder_path)
     
     def recursive_delete_folder(self, folder_path):
-        """Recursively delete all files in a folder."""
+        """Recursively delete all files in a folder in the background."""
         owner = self.user_data.get("login", "")
         repo_name = self.current_repo
-        
-        # Get all files in the folder
-        ok, contents = self.api.get_contents(owner, repo_name, folder_path)
-        if not ok:
-            QMessageBox.warning(self, "Error", f"Failed to list folder contents: {contents}")
-            return
-        
-        if not isinstance(contents, list):
-            contents = [contents]
-        
-        # Track success and failure counts
-        success_count = 0
-        failure_count = 0
-        
-        # Process all items
-        for item in contents:
-            if item["type"] == "dir":
-                # Recursively delete subfolder
-                self.recursive_delete_folder(item["path"])
-            else:
-                # Delete file
+        api = self.api
+        tree = self.repo_tree
+
+        def delete_all():
+            # Get all files in the folder, from the repository tree when it is loaded
+            ok, files = list_files(api, owner, repo_name, folder_path, tree)
+            if not ok:
+                return False, f"Failed to list folder contents: {files}"
+            success_count = 0
+            for item in files:
                 message = f"Delete file {item['path']}"
-                ok, res = self.api.delete_file(owner, repo_name, item["path"], message, item["sha"])
+                ok, res = api.delete_file(owner, repo_name, item["path"], message, item["sha"])
                 if ok:
                     success_count += 1
-                else:
-                    failure_count += 1
+            return True, (success_count, len(files) - success_count)
+
+        self.run_write(self.on_folder_deleted, delete_all)
+
+    def on_folder_deleted(self, result):
+        """Report the outcome of deleting a folder."""
+        ok, res = result
+        if not ok:
+            QMessageBox.warning(self, "Error", res)
+            return
+        success_count, failure_count = res
         
         # Show results
         if failure_count == 0:
@@ -905,7 +944,7 @@ class ModifiedRepoBrowserTab(QWidget):
                                f"Deleted {success_count} files, but failed to delete {failure_count} files")
         
         # Refresh directory listing
-        self.load_directory_contents()
+        self.load_directory_contents(refresh=True)
         self.selected_folder = None
     
     def show_create_repo_dialog(self):
@@ -939,21 +978,21 @@ class ModifiedRepoBrowserTab(QWidget):
             self.create_repo(name, desc, private)
     
     def create_repo(self, name, desc, private):
-        """Create a new repository."""
-        ok, r = self.api.create_repo(name, desc, private)
+        """Create a new repository in the background."""
+        self.run_write(lambda result: self.on_repo_created(name, result),
+                       self.api.create_repo, name, desc, private)
+
+    def on_repo_created(self, name, result):
+        """Report the outcome of creating a repository."""
+        ok, r = result
         if ok:
             QMessageBox.information(
                 self, 
                 "Success", 
                 f"Repository '{name}' created successfully"
             )
-            # Refresh repos
-            self.load_user_repos()
-            
-            # Select the newly created repo
-            index = self.cmb_repos.findText(name)
-            if index >= 0:
-                self.cmb_repos.setCurrentIndex(index)
+            # Refresh repos and select the newly created one
+            self.load_user_repos(select=name)
         else:
             QMessageBox.warning(self, "Error", f"Failed to create repository: {r}")
     
@@ -985,7 +1024,12 @@ class ModifiedRepoBrowserTab(QWidget):
             self.path_history = []
             self.btn_back.setEnabled(False)
             self.path_label.setText("/")
-            self.load_directory_contents()
+            self.repo_tree = None
+            self.selected_folder = None
+            # A file still loading from the previous repo must not land in this one
+            self.clear_selected_file()
+            self.prefetch_budget = PrefetchBudget(self.prefetch_budget_bytes, self.prefetch_max_requests)
+            self.load_directory_contents(refresh=True)
     
     def on_item_double_clicked(self, item, column):
         """Handle double click on tree items (for directory navigation)."""
@@ -1005,7 +1049,7 @@ class ModifiedRepoBrowserTab(QWidget):
             self.load_directory_contents()
     
     def handle_file_drop(self, file_paths):
-        """Handle files dropped onto the drop area."""
+        """Upload files dropped onto the drop area in the background."""
         owner = self.user_data.get("login", "")
         repo_name = self.current_repo
         
@@ -1013,25 +1057,39 @@ class ModifiedRepoBrowserTab(QWidget):
             QMessageBox.warning(self, "Error", "Please select a repository first")
             return
             
-        upload_count = 0
-        failed_count = 0
-        
-        for path in file_paths:
-            try:
-                target_path = self.current_path
-                if target_path:
-                    target_path += "/"
-                target_path += os.path.basename(path)
-                
-                with open(path, 'rb') as fp:
-                    content = fp.read()
-                success, msg = self.api.upload_file(owner, repo_name, target_path, content)
-                if success:
-                    upload_count += 1
-                else:
+        api = self.api
+        folder = self.current_path
+
+        def upload_all():
+            upload_count = 0
+            failed_count = 0
+            for path in file_paths:
+                try:
+                    target_path = folder
+                    if target_path:
+                        target_path += "/"
+                    target_path += os.path.basename(path)
+                    
+                    with open(path, 'rb') as fp:
+                        content = fp.read()
+                    success, msg = api.upload_file(owner, repo_name, target_path, content)
+                    if success:
+                        upload_count += 1
+                    else:
+                        failed_count += 1
+                except Exception as e:
                     failed_count += 1
-            except Exception as e:
-                failed_count += 1
+            return True, (upload_count, failed_count)
+
+        self.run_write(self.on_files_uploaded, upload_all)
+
+    def on_files_uploaded(self, result):
+        """Report the outcome of uploading files."""
+        ok, res = result
+        if not ok:
+            QMessageBox.warning(self, "Upload Failed", str(res))
+            return
+        upload_count, failed_count = res
         
         # Show results and refresh the repo structure
         if upload_count > 0:
@@ -1041,7 +1099,7 @@ class ModifiedRepoBrowserTab(QWidget):
                 f"Successfully uploaded {upload_count} file(s)" + 
                 (f"\nFailed to upload {failed_count} file(s)" if failed_count > 0 else "")
             )
-            self.load_directory_contents()  # Refresh to show the new files
+            self.load_directory_contents(refresh=True)  # Refresh to show the new files
         elif failed_count > 0:
             QMessageBox.warning(
                 self, 
@@ -1063,37 +1121,101 @@ class ModifiedRepoBrowserTab(QWidget):
         
         self.preview.update_preview(content, file_type)
 
-    def load_user_repos(self):
-        ok, data = self.api.get_repos()
+    def load_user_repos(self, select=None):
+        """Load the repository list in the background, then optionally select one."""
+        self.cmb_repos.setEnabled(False)
+        self.cmb_repos.setItemText(0, "Loading repos...")
+        self.tasks.run("repos", lambda result: self.on_repos_loaded(result, select),
+                       self.api.get_repos, stale_ok=True)
+
+    def on_repos_loaded(self, result, select=None):
+        """Fill the repository selector."""
+        self.cmb_repos.setEnabled(True)
+        self.cmb_repos.setItemText(0, "Select Repo")
+        ok, data = result
         if not ok or not isinstance(data, list):
             return
         # Clear but keep the placeholder
+        self.cmb_repos.blockSignals(True)
         self.cmb_repos.clear()
         self.cmb_repos.addItem("Select Repo")
         self.cmb_repos.setItemData(0, QColor(120, 120, 120), Qt.ForegroundRole)
         
         for r in data:
             self.cmb_repos.addItem(r["name"])
-        self.cmb_repos.setCurrentIndex(0)
+        index = self.cmb_repos.findText(self.current_repo) if self.current_repo else 0
+        self.cmb_repos.setCurrentIndex(max(index, 0))
+        self.cmb_repos.blockSignals(False)
+        
+        # Select the requested repo
+        if select:
+            index = self.cmb_repos.findText(select)
+            if index >= 0:
+                self.cmb_repos.setCurrentIndex(index)
 
-    def load_directory_contents(self):
-        """Load contents of the current directory path."""
+    def refresh_repo_tree(self):
+        """Re-check the branch head in the background, e.g. after a commit."""
+        owner = self.user_data.get("login", "")
+        repo = self.current_repo
+        if not owner or not repo:
+            return
+
+        def done(tree):
+            if repo == self.current_repo:
+                self.repo_tree = tree
+
+        self.tasks.run("tree", done, load_tree, self.api, owner, repo, self.repo_tree)
+
+    def load_directory_contents(self, refresh=False):
+        """Load contents of the current directory path.
+
+        Directories are listed from the repository tree without any
+        requests. Otherwise, or with refresh (e.g. after a write), the
+        listing is loaded in the background while the tree shows a loading
+        state; navigating elsewhere in the meantime discards the result.
+        """
         self.tree_files.clear()
         if not self.current_repo:
+            self.tasks.cancel("dir")
             return
             
         owner = self.user_data.get("login", "")
         if not owner:
             return
             
-        ok, content = self.api.get_contents(owner, self.current_repo, self.current_path)
+        if self.repo_tree is not None and not refresh:
+            self.tasks.cancel("dir")
+            self.show_directory(self.repo_tree.list_dir(self.current_path) or [])
+            return
+        
+        loading = QTreeWidgetItem(["Loading..."])
+        loading.setForeground(0, QColor("#a0a0a0"))
+        loading.setFlags(Qt.NoItemFlags)
+        self.tree_files.addTopLevelItem(loading)
+        
+        repo, path = self.current_repo, self.current_path
+        self.tasks.run("dir", lambda result: self.on_directory_loaded(repo, path, result),
+                       load_listing, self.api, owner, repo, path, self.repo_tree)
+
+    def on_directory_loaded(self, repo, path, result):
+        """Show a directory listing that finished loading in the background."""
+        if repo != self.current_repo or path != self.current_path:
+            return
+        tree, ok, content = result
+        self.repo_tree = tree
+        self.tree_files.clear()
         if not ok:
             QMessageBox.warning(self, "Error", f"Failed to load repository contents: {content}")
             return
-            
+        self.show_directory(content)
+
+    def show_directory(self, content):
+        """Fill the file tree with directory items."""
+        self.tree_files.clear()
         if not isinstance(content, list):
             # If it's a single file, handle it differently
             content = [content]
+        self.schedule_prefetch(content)
             
         # First add folders
         for item in sorted(content, key=lambda x: (x["type"] != "dir", x["name"].lower())):
@@ -1108,6 +1230,19 @@ class ModifiedRepoBrowserTab(QWidget):
                 
             self.tree_files.addTopLevelItem(node)
 
+    def schedule_prefetch(self, items):
+        """Queue idle-time downloads of what is likely to be opened from this directory."""
+        self.prefetch.clear()
+        owner = self.user_data.get("login", "")
+        if not owner or not self.current_repo:
+            return
+        files, dirs = prefetch_candidates(items, self.repo_tree)
+        for item in files:
+            self.prefetch.add(prefetch_file, self.api, owner, self.current_repo, item, self.prefetch_budget)
+        for item in dirs:
+            self.prefetch.add(prefetch_listing, self.api, owner, self.current_repo, item["path"],
+                              self.prefetch_budget)
+
     def on_item_clicked(self, item, col):
         data = item.data(0, Qt.UserRole)
         if not data:
@@ -1116,45 +1251,159 @@ class ModifiedRepoBrowserTab(QWidget):
         if data["type"] == "dir":
             # Store selected folder for delete operation
             self.selected_folder = data
-            self.selected_file = None
-            self.selected_sha = None
-            self.selected_path = ""
-            self.text_content.clear()
-            self.text_content.setReadOnly(True)
-            self.preview.update_preview("", "text")
+            self.clear_selected_file()
         elif data["type"] == "file":
             # Clear selected folder
             self.selected_folder = None
+            self.tasks.cancel("file")
+            
+            # Files beyond the inline limit are streamed from the blobs API
+            if data.get("sha") and data.get("size", 0) > INLINE_CONTENT_LIMIT:
+                self.open_large_file(data)
+                return
+            self.loading_file = None
+            self.file_progress.setVisible(False)
             
-            # Load file content
+            # Load file content, from the blob cache when its SHA was seen before
+            content_bytes = blob_cache().get(data["sha"]) if data.get("sha") else None
+            if content_bytes is not None:
+                self.show_file(data, data["sha"], content_bytes)
+                return
+            
+            self.reset_selection()
+            self.text_content.setPlaceholderText(f"Loading {data['name']}...")
             owner = self.user_data.get("login", "")
-            repo_name = self.current_repo
-            path = data["path"]
-            ok, res = self.api.get_contents(owner, repo_name, path)
-            if ok and isinstance(res, dict):
-                if "content" in res:
-                    content_bytes = base64.b64decode(res["content"])
-                    self.text_content.setPlainText(content_bytes.decode('utf-8', errors='replace'))
-                    self.text_content.setReadOnly(False)
-                    self.selected_file = data
-                    self.selected_sha = res["sha"]
-                    self.selected_path = path
-                    
-                    # Update preview based on file type
-                    if path.lower().endswith(('.md', '.markdown')):
-                        self.current_file_type = "markdown"
-                    else:
-                        self.current_file_type = "code"
-                    
-                    self.update_preview()
-                else:
-                    self.text_content.setPlainText("")
-                    self.text_content.setReadOnly(True)
-                    self.preview.update_preview("", "text")
-            else:
-                self.text_content.setPlainText("")
-                self.text_content.setReadOnly(True)
-                self.preview.update_preview("", "text")
+            self.tasks.run("file", lambda result: self.on_file_loaded(data, result),
+                           self.api.get_contents, owner, self.current_repo, data["path"])
+
+    def clear_selected_file(self):
+        """Drop the open file and forget any file still loading."""
+        self.tasks.cancel("file")
+        self.loading_file = None
+        self.file_progress.setVisible(False)
+        self.reset_selection()
+
+    def reset_selection(self):
+        """Empty the editor and forget the open file, so Save/Delete cannot target it."""
+        self.selected_file = None
+        self.selected_sha = None
+        self.selected_path = ""
+        self.update_file_actions()
+        self.text_content.clear()
+        self.text_content.setReadOnly(True)
+        self.text_content.setPlaceholderText("File content here...")
+        self.preview.update_preview("", "text")
+
+    def update_file_actions(self):
+        """Enable Save/Delete only while a loaded file is open and no write is running."""
+        enabled = self.selected_file is not None and not self.writing
+        self.btn_save_file.setEnabled(enabled)
+        self.btn_delete_file.setEnabled(enabled)
+
+    def on_file_loaded(self, data, result):
+        """Show a file whose contents finished loading in the background."""
+        self.text_content.setPlaceholderText("File content here...")
+        ok, res = result
+        if ok and isinstance(res, dict) and res.get("encoding") == "none":
+            # Too large to be returned inline
+            self.open_large_file(dict(data, sha=res["sha"], size=res.get("size", 0)))
+            return
+        if ok and isinstance(res, dict) and "content" in res:
+            content_bytes = base64.b64decode(res["content"])
+            blob_cache().set(res["sha"], content_bytes)
+            self.show_file(data, res["sha"], content_bytes)
+        else:
+            self.text_content.setPlainText("")
+            self.text_content.setReadOnly(True)
+            self.preview.update_preview("", "text")
+
+    def show_file(self, data, sha, content_bytes):
+        """Put a file's content into the editor and preview."""
+        path = data["path"]
+        self.text_content.setPlainText(content_bytes.decode('utf-8', errors='replace'))
+        self.text_content.setReadOnly(False)
+        self.selected_file = data
+        self.selected_sha = sha
+        self.selected_path = path
+        self.update_file_actions()
+        
+        # Update preview based on file type
+        if path.lower().endswith(('.md', '.markdown')):
+            self.current_file_type = "markdown"
+        else:
+            self.current_file_type = "code"
+        
+        self.update_preview()
+
+    def open_large_file(self, data):
+        """Show a file too large for inline contents, downloading it if needed."""
+        self.selected_folder = None
+        # The previous file must not stay selected while the editor is empty
+        self.reset_selection()
+        
+        sha = data["sha"]
+        dest = blob_file_path(sha)
+        self.loading_file = data
+        if os.path.exists(dest):
+            self.show_blob_file(data, dest)
+            return
+        
+        self.text_content.setPlaceholderText(f"Downloading {data['name']}...")
+        self.file_progress.setRange(0, max(data.get("size", 0), 1))
+        self.file_progress.setValue(0)
+        self.file_progress.setVisible(True)
+        
+        # Opening a file whose download is still running waits for that download
+        if sha in self.blob_downloads:
+            return
+        owner = self.user_data.get("login", "")
+        thread = BlobDownloadThread(self.api, owner, self.current_repo, sha, dest)
+        thread.progress.connect(lambda done, total, sha=sha: self.on_blob_progress(sha, done, total))
+        thread.done.connect(lambda ok, res, sha=sha: self.on_blob_downloaded(sha, ok, res))
+        self.blob_downloads[sha] = thread
+        start_thread(thread)
+
+    def on_blob_progress(self, sha, done, total):
+        """Update the download progress bar."""
+        if self.loading_file is None or self.loading_file["sha"] != sha:
+            return
+        if total:
+            self.file_progress.setRange(0, total)
+        self.file_progress.setValue(min(done, self.file_progress.maximum()))
+
+    def on_blob_downloaded(self, sha, ok, res):
+        """Show a large file once its download has finished."""
+        self.blob_downloads.pop(sha, None)
+        data = self.loading_file
+        if data is None or data["sha"] != sha:
+            # The user has moved on to another file
+            return
+        self.file_progress.setVisible(False)
+        self.text_content.setPlaceholderText("File content here...")
+        if ok:
+            self.show_blob_file(data, res)
+        else:
+            self.loading_file = None
+            QMessageBox.warning(self, "Error", f"Failed to download '{data['path']}': {res}")
+
+    def show_blob_file(self, data, file_path):
+        """Load a downloaded blob into the editor, decoding it in chunks."""
+        self.loading_file = None
+        self.text_content.blockSignals(True)
+        self.text_content.clear()
+        cursor = QTextCursor(self.text_content.document())
+        for text in iter_text_chunks(file_path):
+            cursor.insertText(text)
+        self.text_content.blockSignals(False)
+        self.text_content.moveCursor(QTextCursor.Start)
+        self.text_content.setReadOnly(False)
+        self.selected_file = data
+        self.selected_sha = data["sha"]
+        self.selected_path = data["path"]
+        self.update_file_actions()
+        self.current_file_type = "code"
+        # Rendering megabytes of text in the web view is not worth it
+        self.preview.update_preview("", "text")
 
     def save_current_file(self):
         if not self.selected_file or not self.selected_sha:
@@ -1164,16 +1413,53 @@ class ModifiedRepoBrowserTab(QWidget):
         path = self.selected_path
         new_content = self.text_content.toPlainText()
         message = f"Update file {path}"
-        ok, res = self.api.update_file(owner, repo_name, path, message, new_content, self.selected_sha)
+        api = self.api
+        sha = self.selected_sha
+
+        def save():
+            ok, res = api.update_file(owner, repo_name, path, message, new_content, sha)
+            if ok:
+                # Re-fetch the file to get new SHA
+                ok2, refreshed = api.get_contents(owner, repo_name, path)
+                if ok2 and isinstance(refreshed, dict):
+                    return True, refreshed.get("sha", "")
+            return ok, res
+
+        self.run_write(lambda result: self.on_file_saved(repo_name, path, new_content, result), save)
+
+    def on_file_saved(self, repo_name, path, new_content, result):
+        """Report the outcome of a background save."""
+        ok, res = result
         if ok:
             QMessageBox.information(self, "Success", f"File '{path}' updated successfully.")
-            # Re-fetch the file to get new SHA
-            ok2, refreshed = self.api.get_contents(owner, repo_name, path)
-            if ok2 and isinstance(refreshed, dict):
-                self.selected_sha = refreshed.get("sha", "")
+            if isinstance(res, str) and res:
+                content_bytes = new_content.encode()
+                blob_cache().set(res, content_bytes)
+                if repo_name == self.current_repo:
+                    self.update_file_sha(path, res, len(content_bytes))
+            # The commit moved the branch head
+            if repo_name == self.current_repo:
+                self.refresh_repo_tree()
         else:
             QMessageBox.warning(self, "Error", str(res))
 
+    def update_file_sha(self, path, sha, size):
+        """Point the listed item, the repository tree and the selection at a file's new blob.
+
+        Otherwise reopening the file would load the pre-save bytes from the
+        blob cache and the next save would send a stale sha.
+        """
+        for i in range(self.tree_files.topLevelItemCount()):
+            node = self.tree_files.topLevelItem(i)
+            data = node.data(0, Qt.UserRole)
+            if data and data.get("path") == path:
+                node.setData(0, Qt.UserRole, dict(data, sha=sha, size=size))
+        if self.repo_tree is not None and path in self.repo_tree.items:
+            self.repo_tree.items[path].update(sha=sha, size=size)
+        if path == self.selected_path and self.selected_file is not None:
+            self.selected_file = dict(self.selected_file, sha=sha, size=size)
+            self.selected_sha = sha
+
     def delete_current_file(self):
         if not self.selected_file or not self.selected_sha:
             return
@@ -1183,20 +1469,348 @@ class ModifiedRepoBrowserTab(QWidget):
         message = f"Delete file {path}"
         reply = QMessageBox.question(self, "Confirm", f"Really delete '{path}'?",
                                  QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
-        if reply == QMessageBox.Yes:
-            ok, res = self.api.delete_file(owner, repo_name, path, message, self.selected_sha)
+        if reply != QMessageBox.Yes:
+            return
+        self.run_write(lambda result: self.on_file_deleted(repo_name, path, result),
+                       self.api.delete_file, owner, repo_name, path, message, self.selected_sha)
+
+    def on_file_deleted(self, repo_name, path, result):
+        """Report the outcome of deleting a file."""
+        ok, res = result
         if ok:
             QMessageBox.information(self, "Success", f"File '{path}' deleted successfully.")
-            self.text_content.clear()
-            self.text_content.setReadOnly(True)
-            self.selected_file = None
-            self.selected_sha = None
-            self.selected_path = ""
-            self.preview.update_preview("", "text")
-            self.load_directory_contents()
+            if repo_name == self.current_repo and path == self.selected_path:
+                self.clear_selected_file()
+            self.load_directory_contents(refresh=True)
         else:
             QMessageBox.warning(self, "Error", str(res))
 
+    def run_write(self, callback, func, *args):
+        """Run a repository write in the background, then callback(result).
+
+        The contents API rejects commits that race on the same branch, so
+        writes run one at a time and the controls that start them are
+        disabled meanwhile.
+        """
+        self.set_writing(True)
+
+        def done(result):
+            self.set_writing(False)
+            callback(result)
+
+        self.tasks.run("write", done, func, *args)
+
+    def set_writing(self, writing):
+        """Enable or disable every control that writes to the repository."""
+        self.writing = writing
+        for widget in (self.btn_create_repo, self.btn_new_file, self.btn_delete_folder, self.drop_area,
+                       self.btn_browse):
+            widget.setEnabled(not writing)
+        self.update_file_actions()
+
+class UserListModel(QAbstractListModel):
+    """List model of GitHub users that keeps check state for large lists.
+
+    Each user is a dict with 'login', 'avatar_url' and 'info' keys.
+    """
+    AvatarRole = Qt.UserRole + 1
+    InfoRole = Qt.UserRole + 2
+
+    def __init__(self, checkable=True, parent=None):
+        super().__init__(parent)
+        self.checkable = checkable
+        self.users = []
+        self.checked = set()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.users)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        user = self.users[index.row()]
+        if role == Qt.DisplayRole:
+            return user["login"]
+        if role == Qt.CheckStateRole and self.checkable:
+            return Qt.Checked if user["login"] in self.checked else Qt.Unchecked
+        if role == self.AvatarRole:
+            return user.get("avatar_url", "")
+        if role == self.InfoRole:
+            return user.get("info", "GitHub User")
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or not index.isValid() or not self.checkable:
+            return False
+        login = self.users[index.row()]["login"]
+        if value == Qt.Checked:
+            self.checked.add(login)
+        else:
+            self.checked.discard(login)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        return True
+
+    def flags(self, index):
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if self.checkable:
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    def set_users(self, users):
+        """Replace the list of users."""
+        self.beginResetModel()
+        self.users = list(users)
+        self.checked.clear()
+        self.endResetModel()
+
+    def append_users(self, users):
+        """Append users, e.g. as further pages arrive."""
+        users = list(users)
+        if not users:
+            return
+        self.beginInsertRows(QModelIndex(), len(self.users), len(self.users) + len(users) - 1)
+        self.users.extend(users)
+        self.endInsertRows()
+
+    def clear(self):
+        """Remove all users."""
+        self.set_users([])
+
+    def set_all_checked(self, checked):
+        """Check or uncheck every user."""
+        if not self.checkable or not self.users:
+            return
+        self.checked = {u["login"] for u in self.users} if checked else set()
+        self.dataChanged.emit(self.index(0), self.index(len(self.users) - 1), [Qt.CheckStateRole])
+
+    def checked_logins(self):
+        """Return the checked logins in list order."""
+        return [u["login"] for u in self.users if u["login"] in self.checked]
+
+
+class UserItemDelegate(QStyledItemDelegate):
+    """Paints UserListModel rows on demand, mirroring the look of UserWidget.
+
+    Only avatars that are already cached are drawn; UserListView decides
+    which ones to fetch.
+    """
+    unfollow_clicked = pyqtSignal(str)
+
+    ROW_HEIGHT = 76
+    AVATAR_SIZE = 60
+    MARGIN = 8
+    CHECK_SIZE = 22
+    BUTTON_WIDTH = 100
+
+    def __init__(self, checkable=True, show_unfollow=False, parent=None):
+        super().__init__(parent)
+        self.checkable = checkable
+        self.show_unfollow = show_unfollow
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def row_rects(self, rect):
+        """Return the check, avatar, text and button rectangles for a row."""
+        x = rect.left() + self.MARGIN
+        middle = rect.top() + rect.height() // 2
+        check_rect = QRect()
+        if self.checkable:
+            check_rect = QRect(x, middle - self.CHECK_SIZE // 2, self.CHECK_SIZE, self.CHECK_SIZE)
+            x = check_rect.right() + self.MARGIN
+        avatar_rect = QRect(x, middle - self.AVATAR_SIZE // 2, self.AVATAR_SIZE, self.AVATAR_SIZE)
+        x = avatar_rect.right() + self.MARGIN * 2
+        button_rect = QRect()
+        right = rect.right() - self.MARGIN
+        if self.show_unfollow:
+            button_rect = QRect(right - self.BUTTON_WIDTH, middle - 18, self.BUTTON_WIDTH, 36)
+            right = button_rect.left() - self.MARGIN
+        text_rect = QRect(x, rect.top() + self.MARGIN, max(0, right - x), rect.height() - 2 * self.MARGIN)
+        return check_rect, avatar_rect, text_rect, button_rect
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        check_rect, avatar_rect, text_rect, button_rect = self.row_rects(option.rect)
+
+        # Row background
+        if option.state & QStyle.State_Selected:
+            background = QColor("#3a3a5f")
+        elif option.state & QStyle.State_MouseOver:
+            background = QColor("#2f2f45")
+        else:
+            background = None
+        if background is not None:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(background)
+            painter.drawRoundedRect(option.rect.adjusted(2, 2, -2, -2), 8, 8)
+
+        if self.checkable:
+            box = QStyleOptionButton()
+            box.rect = check_rect
+            box.state = QStyle.State_Enabled
+            box.state |= QStyle.State_On if index.data(Qt.CheckStateRole) == Qt.Checked else QStyle.State_Off
+            style = option.widget.style() if option.widget else QApplication.style()
+            style.drawPrimitive(QStyle.PE_IndicatorCheckBox, box, painter, option.widget)
+
+        pixmap = self.avatar_pixmap(index, option.widget)
+        if pixmap is not None:
+            painter.drawPixmap(avatar_rect, pixmap)
+        else:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor("#3f3f5f"))
+            painter.drawEllipse(avatar_rect)
+            painter.setPen(QColor("#a0a0ff"))
+            painter.drawText(avatar_rect, Qt.AlignCenter, "👤")
+
+        # Username and info line
+        name_font = QFont(option.font)
+        name_font.setPointSize(12)
+        name_font.setBold(True)
+        info_font = QFont(option.font)
+        info_font.setPointSize(9)
+        half = text_rect.height() // 2
+        painter.setFont(name_font)
+        painter.setPen(QColor("#ffffff"))
+        painter.drawText(QRect(text_rect.left(), text_rect.top(), text_rect.width(), half),
+                         Qt.AlignLeft | Qt.AlignBottom, index.data(Qt.DisplayRole))
+        painter.setFont(info_font)
+        painter.setPen(QColor("#a0a0ff"))
+        painter.drawText(QRect(text_rect.left(), text_rect.top() + half + 2, text_rect.width(), half),
+                         Qt.AlignLeft | Qt.AlignTop, index.data(UserListModel.InfoRole))
+
+        if self.show_unfollow:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor("#8f5e5e"))
+            painter.drawRoundedRect(button_rect, 6, 6)
+            painter.setPen(QColor("#ffffff"))
+            painter.drawText(button_rect, Qt.AlignCenter, "Unfollow")
+
+        painter.restore()
+
+    def avatar_key(self, index, view):
+        """Return the (url, device pixels) avatar key for a row, or None."""
+        url = index.data(UserListModel.AvatarRole)
+        if not url:
+            return None
+        scale = view.devicePixelRatioF() if view else 1.0
+        return url, max(1, round(self.AVATAR_SIZE * scale))
+
+    def avatar_pixmap(self, index, view):
+        """Return the cached avatar for a row, or None if it is not loaded yet."""
+        key = self.avatar_key(index, view)
+        if key is None:
+            return None
+        pixmap = avatar_service().cached(*key)
+        if pixmap is None:
+            return None
+        pixmap = QPixmap(pixmap)
+        pixmap.setDevicePixelRatio(view.devicePixelRatioF() if view else 1.0)
+        return pixmap
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            check_rect, _, _, button_rect = self.row_rects(option.rect)
+            if self.checkable and check_rect.adjusted(-4, -4, 4, 4).contains(event.pos()):
+                checked = index.data(Qt.CheckStateRole) == Qt.Checked
+                model.setData(index, Qt.Unchecked if checked else Qt.Checked, Qt.CheckStateRole)
+                return True
+            if self.show_unfollow and button_rect.contains(event.pos()):
+                self.unfollow_clicked.emit(index.data(Qt.DisplayRole))
+                return True
+        return super().editorEvent(event, model, option, index)
+
+
+class UserListView(QListView):
+    """Virtualized list of GitHub users backed by UserListModel.
+
+    Rows are painted by UserItemDelegate instead of one widget per user, so
+    very long lists stay cheap to build and scroll. Avatars are fetched only
+    for the rows in view plus a small prefetch window, and fetches for rows
+    that scroll away are cancelled.
+    """
+    unfollow_clicked = pyqtSignal(str)
+
+    # Rows above and below the viewport whose avatars are fetched ahead
+    PREFETCH_ROWS = 10
+    # Wait for scrolling to settle before requesting avatars
+    SCROLL_SETTLE_MS = 50
+
+    def __init__(self, checkable=True, show_unfollow=False, parent=None):
+        super().__init__(parent)
+        self.user_model = UserListModel(checkable, self)
+        self.setModel(self.user_model)
+        self.delegate = UserItemDelegate(checkable, show_unfollow, self)
+        self.delegate.unfollow_clicked.connect(self.unfollow_clicked)
+        self.setItemDelegate(self.delegate)
+        self.setUniformItemSizes(True)
+        self.setMouseTracking(True)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+
+        self.avatar_requests = {}
+        self.avatar_timer = QTimer(self)
+        self.avatar_timer.setSingleShot(True)
+        self.avatar_timer.setInterval(self.SCROLL_SETTLE_MS)
+        self.avatar_timer.timeout.connect(self.update_avatar_requests)
+        self.verticalScrollBar().valueChanged.connect(self.schedule_avatar_requests)
+        self.user_model.modelReset.connect(self.schedule_avatar_requests)
+        self.user_model.rowsInserted.connect(self.schedule_avatar_requests)
+
+    def schedule_avatar_requests(self, *args):
+        """Refresh the avatar requests once scrolling has settled."""
+        self.avatar_timer.start()
+
+    def visible_rows(self):
+        """Return the first and last row intersecting the viewport."""
+        count = self.user_model.rowCount()
+        first = self.indexAt(QPoint(0, 0)).row()
+        last = self.indexAt(QPoint(0, self.viewport().height() - 1)).row()
+        return max(first, 0), last if last >= 0 else count - 1
+
+    def update_avatar_requests(self):
+        """Fetch avatars for rows near the viewport and cancel the rest."""
+        wanted = {}
+        count = self.user_model.rowCount()
+        if self.isVisible() and count:
+            first, last = self.visible_rows()
+            start = max(0, first - self.PREFETCH_ROWS)
+            end = min(count - 1, last + self.PREFETCH_ROWS)
+            for row in range(start, end + 1):
+                key = self.delegate.avatar_key(self.user_model.index(row), self)
+                if key is None:
+                    continue
+                priority = VISIBLE_PRIORITY if first <= row <= last else PREFETCH_PRIORITY
+                wanted[key] = max(priority, wanted.get(key, priority))
+
+        for key in list(self.avatar_requests):
+            if key not in wanted:
+                avatar_service().cancel(*key, self.avatar_requests.pop(key))
+
+        service = avatar_service()
+        for key, priority in wanted.items():
+            if key in self.avatar_requests or service.cached(*key) is not None:
+                continue
+            callback = lambda pixmap, key=key: self.on_avatar_loaded(key)
+            self.avatar_requests[key] = callback
+            service.request(*key, callback, priority)
+
+    def on_avatar_loaded(self, key):
+        """Repaint once an avatar has arrived."""
+        self.avatar_requests.pop(key, None)
+        self.viewport().update()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.schedule_avatar_requests()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.schedule_avatar_requests()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.schedule_avatar_requests()
+
 class UserWidget(QWidget):
     """Widget displaying a GitHub user with optional actions."""
     unfollow_clicked = pyqtSignal(str)
@@ -1575,6 +2189,7 @@ class LoginWindow(QDialog):
         self.btn_edit_token.setEnabled(False)
         self.selected_token = None
         self.selected_user = None
+        self.token_items = {}
 
         hl = QHBoxLayout()
         hl.addWidget(self.btn_manage)
@@ -1592,7 +2207,7 @@ class LoginWindow(QDialog):
         
         # Connect signals
         self.btn_login.clicked.connect(self.accept)
-        self.btn_refresh.clicked.connect(self.load_tokens)
+        self.btn_refresh.clicked.connect(lambda: self.load_tokens(revalidate=True))
         self.btn_manage.clicked.connect(self.manage_tokens)
         self.btn_edit_token.clicked.connect(self.edit_selected_token)
         self.list_tokens.itemClicked.connect(self.token_selected)
@@ -1602,6 +2217,9 @@ class LoginWindow(QDialog):
         self.drag_pos = None
         
         # Load tokens
+        self.registry = account_registry()
+        self.registry.accounts_reloaded.connect(self.show_accounts)
+        self.registry.account_changed.connect(self.on_account_changed)
         self.load_tokens()
         
     def on_item_double_clicked(self, item):
@@ -1632,54 +2250,25 @@ class LoginWindow(QDialog):
         y = (screen_rect.height() - window_size.height()) // 2
         self.move(x, y)
 
-    def load_tokens(self):
-        """Load and display available tokens."""
+    def load_tokens(self, revalidate=False):
+        """Load and display available tokens.
+
+        Known identities are shown immediately; the account registry
+        validates the rest in the background and the rows update as
+        results arrive.
+        """
+        self.registry.load(revalidate)
+
+    def show_accounts(self):
+        """Rebuild the token list from the account registry."""
         self.list_tokens.clear()
-        load_dotenv(find_dotenv(usecwd=True))
+        self.token_items = {}
         
-        for k, v in os.environ.items():
-            if k.startswith("GITHUB_TOKEN_"):
-                api = GitHubAPI(v)
-                ok, data = api.validate_token()
-                item = QListWidgetItem()
-                
-                if ok:
-                    username = data['login']
-                    item.setText(f"{k[13:]} ({username})")
-                    item.setIcon(QIcon.fromTheme("user-info"))
-                    item.setData(Qt.UserRole, (v, data))
-                    
-                    # Create custom widget
-                    user_widget = QWidget()
-                    layout = QHBoxLayout(user_widget)
-                    
-                    # Avatar
-                    avatar = AvatarLabel()
-                    avatar.setFixedSize(45, 45)
-                    avatar.set_avatar(data.get('avatar_url', ''))
-                    
-                    # User info
-                    user_info = QVBoxLayout()
-                    name_label = QLabel(f"<b>{username}</b>")
-                    token_label = QLabel(k[13:])
-                    token_label.setStyleSheet("color: #a0a0a0; font-size: 9pt;")
-                    
-                    user_info.addWidget(name_label)
-                    user_info.addWidget(token_label)
-                    
-                    layout.addWidget(avatar)
-                    layout.addLayout(user_info, 1)
-                    layout.setContentsMargins(15, 15, 15, 15)
-                    
-                    # Set the custom widget for this item
-                    item.setSizeHint(user_widget.sizeHint())
-                    self.list_tokens.addItem(item)
-                    self.list_tokens.setItemWidget(item, user_widget)
-                else:
-                    item.setText(f"{k[13:]} (Invalid)")
-                    item.setForeground(QColor("#ff6060"))
-                    item.setIcon(QIcon.fromTheme("dialog-error"))
-                    self.list_tokens.addItem(item)
+        for name, entry in self.registry.items():
+            item = QListWidgetItem()
+            self.list_tokens.addItem(item)
+            self.token_items[name] = item
+            self.show_entry(item, name, entry)
                     
         if self.list_tokens.count() == 0:
             # No tokens found, show a message
@@ -1688,9 +2277,79 @@ class LoginWindow(QDialog):
             no_tokens.setTextAlignment(Qt.AlignCenter)
             self.list_tokens.addItem(no_tokens)
             
+        self.selected_token = self.selected_user = None
+        self.btn_login.setText("Login")
         self.btn_login.setEnabled(False)
         self.btn_edit_token.setEnabled(False)
 
+    def show_entry(self, item, name, entry):
+        """Show an account in its list row according to its validation state."""
+        if entry["status"] == "valid":
+            self.show_identity(item, name, entry["token"], entry["user"])
+        elif entry["status"] == "invalid":
+            self.show_invalid(item, name)
+        else:
+            item.setText(f"{name} (Validating...)")
+            item.setForeground(QColor("#a0a0a0"))
+
+    def show_identity(self, item, name, token, data):
+        """Show a validated account in its list row."""
+        username = data['login']
+        item.setText(f"{name} ({username})")
+        item.setForeground(QColor("#e0e0e0"))
+        item.setIcon(QIcon.fromTheme("user-info"))
+        item.setData(Qt.UserRole, (token, data))
+        
+        # Create custom widget
+        user_widget = QWidget()
+        layout = QHBoxLayout(user_widget)
+        
+        # Avatar
+        avatar = AvatarLabel()
+        avatar.setFixedSize(45, 45)
+        avatar.set_avatar(data.get('avatar_url', ''))
+        
+        # User info
+        user_info = QVBoxLayout()
+        name_label = QLabel(f"<b>{username}</b>")
+        token_label = QLabel(name)
+        token_label.setStyleSheet("color: #a0a0a0; font-size: 9pt;")
+        
+        user_info.addWidget(name_label)
+        user_info.addWidget(token_label)
+        
+        layout.addWidget(avatar)
+        layout.addLayout(user_info, 1)
+        layout.setContentsMargins(15, 15, 15, 15)
+        
+        # Set the custom widget for this item
+        item.setSizeHint(user_widget.sizeHint())
+        self.list_tokens.setItemWidget(item, user_widget)
+
+    def show_invalid(self, item, name):
+        """Show a token GitHub did not accept."""
+        self.list_tokens.removeItemWidget(item)
+        item.setText(f"{name} (Invalid)")
+        item.setForeground(QColor("#ff6060"))
+        item.setIcon(QIcon.fromTheme("dialog-error"))
+        item.setData(Qt.UserRole, None)
+
+    def on_account_changed(self, name):
+        """Update a row once its token has been validated in the background."""
+        item = self.token_items.get(name)
+        entry = self.registry.get(name)
+        if item is None or entry is None:
+            return
+        self.show_entry(item, name, entry)
+        if self.selected_token == entry["token"]:
+            if entry["status"] == "valid":
+                self.selected_user = entry["user"]
+            else:
+                self.selected_token = self.selected_user = None
+                self.btn_login.setText("Login")
+                self.btn_login.setEnabled(False)
+                self.btn_edit_token.setEnabled(False)
+
     def token_selected(self, item):
         """Handle token selection."""
         d = item.data(Qt.UserRole)
@@ -1760,9 +2419,8 @@ class LoginWindow(QDialog):
                 QMessageBox.warning(self, "Invalid Token", "Token cannot be empty")
                 return
                 
-            # Validate the token
-            api = GitHubAPI(new_token)
-            valid, data = api.validate_token()
+            # Validate the token, caching its identity for the reload below
+            valid, data = validate_identity(new_token)
             
             if valid:
                 # Update the token in the .env file
@@ -1913,18 +2571,22 @@ class DropArea(QWidget):
         self.label.setText("Drop files here to upload")
 
 class MarkdownPreview(QWidget):
-    """Widget to preview markdown or code with proper styling."""
+    """Widget to preview markdown or code with proper styling.
+
+    The web view (and with it QtWebEngine) is only created once the
+    preview is first shown; until then the latest HTML is just kept.
+    """
     def __init__(self, parent=None):
         super().__init__(parent)
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
-        
-        # Preview WebView
-        self.preview = QWebEngineView()
-        self.preview.setMinimumHeight(200)
-        layout.addWidget(self.preview)
+        self.setMinimumHeight(200)
         self.setLayout(layout)
         
+        # Preview WebView, created on first show
+        self.preview = None
+        self.pending_html = None
+        
         # Enhanced GitHub-style CSS with dark theme
         self.github_css = """
         <style>
@@ -2071,8 +2733,29 @@ class MarkdownPreview(QWidget):
         """
         
         self.update_preview("")
-        
-        # Set fixed zoom to 90%
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.preview is None:
+            self.create_view()
+
+    def create_view(self):
+        """Create the web view and render the content queued so far."""
+        from PyQt5.QtWebEngineWidgets import QWebEngineView
+        self.preview = QWebEngineView()
+        self.preview.setMinimumHeight(200)
+        self.layout().addWidget(self.preview)
+        if self.pending_html is not None:
+            self.set_html(self.pending_html)
+            self.pending_html = None
+
+    def set_html(self, html):
+        """Show html in the web view, or keep it until the view exists."""
+        if self.preview is None:
+            self.pending_html = html
+            return
+        self.preview.setHtml(html)
+        # Maintain fixed zoom at 90%
         self.preview.setZoomFactor(0.9)
 
     def update_preview(self, content, file_type="markdown", dark_mode=True):
@@ -2082,12 +2765,13 @@ class MarkdownPreview(QWidget):
         
         if not content:
             html = f"{self.github_css}<div class='markdown-body'><h3>Preview</h3><p>Content will appear here when you edit the document.</p></div>"
-            self.preview.setHtml(html)
+            self.set_html(html)
             return
             
         if file_type == "markdown":
             # Convert markdown to HTML
             try:
+                import markdown
                 html_content = markdown.markdown(content, extensions=['tables', 'fenced_code'])
                 html = f"{self.github_css}<div class='markdown-body'>{html_content}</div>"
             except Exception as e:
@@ -2142,6 +2826,4 @@ class MarkdownPreview(QWidget):
             </div>
             """
         
-        self.preview.setHtml(html)
-        # Maintain fixed zoom at 90%
-        self.preview.setZoomFactor(0.9)
\ No newline at end of file
+        self.set_html(html)
\ No newline at end of file